@@ -0,0 +1,59 @@
+import argparse
+import time
+
+from lab1_a import RabbitProblemSolver
+from search_engine import RabbitSearchEngine
+
+
+class CountingRabbitProblemSolver(RabbitProblemSolver):
+    def __init__(self, start_config, end_config):
+        super().__init__(start_config, end_config)
+        self.nodes_expanded = 0
+
+    def get_successor_states(self, state):
+        self.nodes_expanded += 1
+        return super().get_successor_states(state)
+
+
+def run_reference(engine):
+    solver = CountingRabbitProblemSolver(engine.start_config, engine.goal_config)
+    start_time = time.perf_counter()
+    path = solver.breadth_first_search()
+    return path, solver.nodes_expanded, time.perf_counter() - start_time
+
+
+def run_engine(engine, method):
+    start_time = time.perf_counter()
+    path = engine.search(method)
+    return path, engine.nodes_expanded, time.perf_counter() - start_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare rabbit-crossing search engines as N grows.")
+    parser.add_argument('--max-rabbits', type=int, default=10)
+    parser.add_argument('--reference-limit', type=int, default=9,
+                        help="largest N to run the original path-copying BFS on")
+    parser.add_argument('--idastar-limit', type=int, default=8,
+                        help="largest N to run IDA* on")
+    args = parser.parse_args()
+
+    methods = ['bfs', 'bidirectional', 'astar', 'idastar']
+    print(f"{'N':>3} {'method':<14} {'moves':>6} {'expanded':>10} {'seconds':>9}")
+
+    for rabbits in range(1, args.max_rabbits + 1):
+        engine = RabbitSearchEngine.for_rabbits(rabbits)
+        runs = []
+        if rabbits <= args.reference_limit:
+            runs.append(('reference', run_reference(engine)))
+        for method in methods:
+            if method == 'idastar' and rabbits > args.idastar_limit:
+                continue
+            runs.append((method, run_engine(engine, method)))
+
+        for name, (path, expanded, seconds) in runs:
+            moves = len(path) - 1 if path else None
+            print(f"{rabbits:>3} {name:<14} {moves!s:>6} {expanded:>10} {seconds:>9.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+import argparse
+import random
+import time
+
+from lab1_a import RabbitProblemSolver, RabbitState
+from lab1_b import GameSolver
+from packed_state import MoveTable, compact_state
+from search_engine import rabbit_configurations
+
+
+def sample_configurations(rabbits_per_side, count, seed):
+    # Random walks from the start give boards that are actually reachable,
+    # with a realistic mix of legal and illegal candidate moves.
+    rng = random.Random(seed)
+    start_config, _ = rabbit_configurations(rabbits_per_side)
+    solver = GameSolver(start_config, None)
+    configurations = []
+    state = start_config
+    while len(configurations) < count:
+        successors = solver.get_successors(state)
+        if not successors:
+            state = start_config
+            continue
+        state = rng.choice(successors)
+        configurations.append(state)
+    return configurations
+
+
+def successors_per_second(generate, states, repeat):
+    produced = 0
+    start_time = time.perf_counter()
+    for _ in range(repeat):
+        for state in states:
+            produced += len(generate(state))
+    return produced / (time.perf_counter() - start_time)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure successor generation throughput.")
+    parser.add_argument('--rabbits', type=int, nargs='+', default=[10, 50, 100])
+    parser.add_argument('--states', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'N':>4} {'RabbitState':>14} {'tuples':>14} {'compact':>14} {'speedup':>8}")
+    for rabbits in args.rabbits:
+        configurations = sample_configurations(rabbits, args.states, args.seed)
+        length = len(configurations[0])
+
+        rabbit_solver = RabbitProblemSolver(configurations[0], configurations[0])
+        rabbit_states = [RabbitState(configuration) for configuration in configurations]
+        game_solver = GameSolver(configurations[0], configurations[0])
+        move_table = MoveTable(length)
+        compact_states = [compact_state(configuration) for configuration in configurations]
+
+        object_rate = successors_per_second(rabbit_solver.get_successor_states, rabbit_states, args.repeat)
+        tuple_rate = successors_per_second(game_solver.get_successors, configurations, args.repeat)
+        compact_rate = successors_per_second(move_table.successors, compact_states, args.repeat)
+        print(f"{rabbits:>4} {object_rate:>14,.0f} {tuple_rate:>14,.0f} {compact_rate:>14,.0f} "
+              f"{compact_rate / object_rate:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,270 @@
+import argparse
+import heapq
+import os
+import resource
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from packed_state import BLANK_BITS, MoveTable, compact_state, expand_state
+from search_engine import rabbit_configurations
+
+BLOCK_RECORDS = 1 << 16
+
+_move_tables = {}
+
+
+def record_width(length):
+    return (2 * length + BLANK_BITS + 7) // 8
+
+
+def iter_records(path, width, start=0, count=None):
+    # States are stored big-endian with a fixed width, so comparing the raw
+    # bytes orders them exactly like the integers they encode.
+    with open(path, 'rb') as file:
+        file.seek(start * width)
+        remaining = count
+        while remaining is None or remaining > 0:
+            records = BLOCK_RECORDS if remaining is None else min(BLOCK_RECORDS, remaining)
+            block = file.read(records * width)
+            if not block:
+                break
+            for offset in range(0, len(block), width):
+                yield block[offset:offset + width]
+            if remaining is not None:
+                remaining -= len(block) // width
+
+
+def write_records(path, records):
+    count = 0
+    with open(path, 'wb') as file:
+        buffer = []
+        for record in records:
+            buffer.append(record)
+            if len(buffer) == BLOCK_RECORDS:
+                file.write(b''.join(buffer))
+                count += len(buffer)
+                buffer = []
+        file.write(b''.join(buffer))
+        count += len(buffer)
+    return count
+
+
+def unique(records):
+    previous = None
+    for record in records:
+        if record != previous:
+            yield record
+            previous = record
+
+
+def contains_record(path, width, record):
+    with open(path, 'rb') as file:
+        low, high = 0, os.path.getsize(path) // width
+        while low < high:
+            middle = (low + high) // 2
+            file.seek(middle * width)
+            value = file.read(width)
+            if value < record:
+                low = middle + 1
+            elif value > record:
+                high = middle
+            else:
+                return True
+    return False
+
+
+def expand_run(layer_path, start, count, length, run_path):
+    moves = _move_tables.get(length)
+    if moves is None:
+        moves = _move_tables[length] = MoveTable(length)
+    width = record_width(length)
+
+    successors = set()
+    for record in iter_records(layer_path, width, start, count):
+        successors.update(moves.successors(int.from_bytes(record, 'big')))
+    write_records(run_path, (state.to_bytes(width, 'big') for state in sorted(successors)))
+    return run_path, peak_memory_kb()
+
+
+def peak_memory_kb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+class ExternalBreadthFirstSearch:
+    def __init__(self, start_config, goal_config, work_dir=None, workers=None, states_per_task=1 << 18):
+        self.start_config = tuple(start_config)
+        self.goal_config = tuple(goal_config)
+        self.length = len(self.start_config)
+        self.width = record_width(self.length)
+        self.moves = MoveTable(self.length)
+        self.start = compact_state(self.start_config)
+        self.goal = compact_state(self.goal_config)
+        self.work_dir = work_dir
+        self.workers = workers or os.cpu_count()
+        self.states_per_task = states_per_task
+        self.layer_stats = []
+
+    @classmethod
+    def for_rabbits(cls, rabbits_per_side, **kwargs):
+        return cls(*rabbit_configurations(rabbits_per_side), **kwargs)
+
+    def search(self, report=None):
+        self.layer_stats = []
+        if self.work_dir is not None:
+            os.makedirs(self.work_dir, exist_ok=True)
+            return self._search(self.work_dir, report)
+        with tempfile.TemporaryDirectory(prefix='rabbit_bfs_') as work_dir:
+            return self._search(work_dir, report)
+
+    def _layer_path(self, work_dir, depth):
+        return os.path.join(work_dir, f'layer_{depth:05d}.bin')
+
+    def _search(self, work_dir, report):
+        goal_record = self.goal.to_bytes(self.width, 'big')
+        layer_path = self._layer_path(work_dir, 0)
+        visited_path = os.path.join(work_dir, 'visited_00000.bin')
+        write_records(layer_path, [self.start.to_bytes(self.width, 'big')])
+        write_records(visited_path, [self.start.to_bytes(self.width, 'big')])
+        if self.start == self.goal:
+            return [self.start_config]
+
+        executor = ProcessPoolExecutor(self.workers) if self.workers > 1 else None
+        try:
+            depth = 0
+            layer_size = 1
+            worker_memory = 0
+            while layer_size:
+                start_time = time.perf_counter()
+                results = self._expand_layer(executor, work_dir, layer_path, layer_size, depth)
+                run_paths = [run_path for run_path, _ in results]
+                worker_memory = max(worker_memory, *(memory for _, memory in results))
+
+                depth += 1
+                next_layer_path = self._layer_path(work_dir, depth)
+                next_visited_path = os.path.join(work_dir, f'visited_{depth:05d}.bin')
+                layer_size, visited_size, found = self._merge_layer(
+                    run_paths, visited_path, next_layer_path, next_visited_path, goal_record)
+
+                for run_path in run_paths:
+                    os.remove(run_path)
+                os.remove(visited_path)
+                layer_path, visited_path = next_layer_path, next_visited_path
+
+                stats = {
+                    'depth': depth,
+                    'states': layer_size,
+                    'visited': visited_size,
+                    'runs': len(run_paths),
+                    'seconds': time.perf_counter() - start_time,
+                    'peak_memory_kb': peak_memory_kb(),
+                    'peak_worker_memory_kb': worker_memory,
+                }
+                self.layer_stats.append(stats)
+                if report is not None:
+                    report(stats)
+
+                if found:
+                    return self._reconstruct_path(work_dir, depth)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        return None
+
+    def _expand_layer(self, executor, work_dir, layer_path, layer_size, depth):
+        tasks = []
+        for index, start in enumerate(range(0, layer_size, self.states_per_task)):
+            count = min(self.states_per_task, layer_size - start)
+            run_path = os.path.join(work_dir, f'run_{depth:05d}_{index:05d}.bin')
+            tasks.append((layer_path, start, count, self.length, run_path))
+
+        if executor is None:
+            return [expand_run(*task) for task in tasks]
+        return list(executor.map(expand_run, *zip(*tasks)))
+
+    def _merge_layer(self, run_paths, visited_path, layer_path, next_visited_path, goal_record):
+        # One pass over the sorted runs and the sorted visited file both drops
+        # states seen in earlier layers and produces the updated visited file.
+        candidates = unique(heapq.merge(*(iter_records(path, self.width) for path in run_paths)))
+        visited = iter_records(visited_path, self.width)
+        layer_size = visited_size = 0
+        found = False
+
+        with open(layer_path, 'wb') as layer_file, open(next_visited_path, 'wb') as visited_file:
+            layer_buffer, visited_buffer = [], []
+            seen = next(visited, None)
+            for record in candidates:
+                while seen is not None and seen < record:
+                    visited_buffer.append(seen)
+                    seen = next(visited, None)
+                if seen == record:
+                    continue
+                layer_buffer.append(record)
+                visited_buffer.append(record)
+                if record == goal_record:
+                    found = True
+                if len(layer_buffer) >= BLOCK_RECORDS:
+                    layer_file.write(b''.join(layer_buffer))
+                    layer_size += len(layer_buffer)
+                    layer_buffer = []
+                if len(visited_buffer) >= BLOCK_RECORDS:
+                    visited_file.write(b''.join(visited_buffer))
+                    visited_size += len(visited_buffer)
+                    visited_buffer = []
+
+            while seen is not None:
+                visited_buffer.append(seen)
+                seen = next(visited, None)
+            layer_file.write(b''.join(layer_buffer))
+            visited_file.write(b''.join(visited_buffer))
+            layer_size += len(layer_buffer)
+            visited_size += len(visited_buffer)
+
+        return layer_size, visited_size, found
+
+    def _reconstruct_path(self, work_dir, depth):
+        # Only layer files are kept, so walk back from the goal by looking up
+        # each predecessor in the layer one step closer to the start.
+        state = self.goal
+        path = [self.goal_config]
+        for previous_depth in range(depth - 1, -1, -1):
+            layer_path = self._layer_path(work_dir, previous_depth)
+            for predecessor in self.moves.predecessors(state):
+                if contains_record(layer_path, self.width, predecessor.to_bytes(self.width, 'big')):
+                    state = predecessor
+                    break
+            path.append(expand_state(state, self.length))
+        path.reverse()
+        return path
+
+
+def print_layer(stats):
+    print(f"{stats['depth']:>6} {stats['states']:>12,} {stats['visited']:>14,} {stats['runs']:>5} "
+          f"{stats['seconds']:>9.3f} {stats['peak_memory_kb']:>12,} {stats['peak_worker_memory_kb']:>12,}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Layered external-memory BFS for the rabbit puzzle.")
+    parser.add_argument('--rabbits', type=int, default=8)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--work-dir', default=None, help="keep layer files here instead of a temporary directory")
+    parser.add_argument('--states-per-task', type=int, default=1 << 18)
+    args = parser.parse_args()
+
+    search = ExternalBreadthFirstSearch.for_rabbits(args.rabbits, work_dir=args.work_dir, workers=args.workers,
+                                                    states_per_task=args.states_per_task)
+    print(f"{'depth':>6} {'states':>12} {'visited':>14} {'runs':>5} {'seconds':>9} {'peak KB':>12} "
+          f"{'worker KB':>12}")
+    start_time = time.perf_counter()
+    path = search.search(report=print_layer)
+    elapsed = time.perf_counter() - start_time
+
+    if path:
+        print(f"Solved N={args.rabbits} in {len(path) - 1} moves, {elapsed:.2f} s")
+    else:
+        print("No solution found.")
+
+
+if __name__ == "__main__":
+    main()
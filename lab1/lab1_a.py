@@ -1,5 +1,8 @@
 from collections import deque
 
+from packed_state import packed_breadth_first_search
+from search_engine import RabbitSearchEngine
+
 class RabbitState:
     def __init__(self, configuration):
         self.configuration = configuration
@@ -66,6 +69,13 @@ class RabbitProblemSolver:
         
         return None
 
+    def packed_breadth_first_search(self):
+        return packed_breadth_first_search(self.start_state.configuration, self.end_state.configuration)
+
+    def search(self, method='bidirectional'):
+        engine = RabbitSearchEngine(self.start_state.configuration, self.end_state.configuration)
+        return engine.search(method)
+
 
 def main():
     initial_configuration = (-1, -1, -1, 0, 1, 1, 1)
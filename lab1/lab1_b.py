@@ -1,5 +1,8 @@
 from collections import deque
 
+from packed_state import packed_breadth_first_search
+from search_engine import RabbitSearchEngine
+
 class GameSolver:
     def __init__(self, initial, target):
         self.initial_state = initial
@@ -54,6 +57,12 @@ class GameSolver:
 
         return None
 
+    def packed_breadth_first_search(self):
+        return packed_breadth_first_search(self.initial_state, self.final_state)
+
+    def search(self, method='bidirectional'):
+        return RabbitSearchEngine(self.initial_state, self.final_state).search(method)
+
 def main():
     start_state = (-1, -1, -1, 0, 1, 1, 1)
     goal_state = (1, 1, 1, 0, -1, -1, -1)
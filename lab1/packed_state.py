@@ -0,0 +1,104 @@
+from collections import deque
+
+# Each cell takes 2 bits: 0 for the empty cell, 1 for a -1 rabbit, 2 for a 1 rabbit.
+CELL_CODES = {0: 0, -1: 1, 1: 2}
+CELL_VALUES = (0, -1, 1)
+LEFT_RABBIT = CELL_CODES[-1]
+RIGHT_RABBIT = CELL_CODES[1]
+
+# A compact state keeps the blank position in its low bits and the packed
+# board above it, so successors never have to search for the blank.
+BLANK_BITS = 8
+BLANK_MASK = (1 << BLANK_BITS) - 1
+MAX_CELLS = 1 << BLANK_BITS
+
+
+def pack_configuration(configuration):
+    code = 0
+    for position, value in enumerate(configuration):
+        code |= CELL_CODES[value] << (2 * position)
+    return code
+
+
+def unpack_configuration(code, length):
+    return tuple(CELL_VALUES[(code >> (2 * position)) & 3] for position in range(length))
+
+
+def compact_state(configuration):
+    if len(configuration) > MAX_CELLS:
+        raise ValueError(f"Boards are limited to {MAX_CELLS} cells")
+    return (pack_configuration(configuration) << BLANK_BITS) | configuration.index(0)
+
+
+def expand_state(state, length):
+    return unpack_configuration(state >> BLANK_BITS, length)
+
+
+class MoveTable:
+    def __init__(self, length):
+        if length > MAX_CELLS:
+            raise ValueError(f"Boards are limited to {MAX_CELLS} cells")
+        self.length = length
+        # For every blank position, the neighbours a rabbit may come from, the
+        # rabbit that has to be there, and the XOR that performs the move.
+        self.forward = [self._moves(empty_index, reverse=False) for empty_index in range(length)]
+        self.backward = [self._moves(empty_index, reverse=True) for empty_index in range(length)]
+
+    def _moves(self, empty_index, reverse):
+        moves = []
+        for move in (-2, -1, 1, 2):
+            new_index = empty_index + move
+            if not 0 <= new_index < self.length:
+                continue
+            # -1 rabbits only move right and 1 rabbits only move left; undoing
+            # a move sees the same rabbits on the other side of the blank.
+            if (new_index < empty_index) != reverse:
+                cell = LEFT_RABBIT
+            else:
+                cell = RIGHT_RABBIT
+            shift = BLANK_BITS + 2 * new_index
+            delta = (cell << shift) ^ (cell << (BLANK_BITS + 2 * empty_index)) ^ empty_index ^ new_index
+            moves.append((shift, cell, delta))
+        return tuple(moves)
+
+    def successors(self, state):
+        return [state ^ delta for shift, cell, delta in self.forward[state & BLANK_MASK]
+                if (state >> shift) & 3 == cell]
+
+    def predecessors(self, state):
+        return [state ^ delta for shift, cell, delta in self.backward[state & BLANK_MASK]
+                if (state >> shift) & 3 == cell]
+
+
+def reconstruct_path(parents, state, length):
+    path = []
+    while state is not None:
+        path.append(expand_state(state, length))
+        state = parents[state]
+    path.reverse()
+    return path
+
+
+def packed_breadth_first_search(start_config, goal_config):
+    length = len(start_config)
+    moves = MoveTable(length)
+    start = compact_state(start_config)
+    goal = compact_state(goal_config)
+
+    # One parent pointer per visited state; the path only exists at the end.
+    parents = {start: None}
+    if start == goal:
+        return reconstruct_path(parents, start, length)
+    queue = deque([start])
+
+    while queue:
+        current_state = queue.popleft()
+
+        for successor in moves.successors(current_state):
+            if successor not in parents:
+                parents[successor] = current_state
+                if successor == goal:
+                    return reconstruct_path(parents, successor, length)
+                queue.append(successor)
+
+    return None
@@ -0,0 +1,205 @@
+import heapq
+from collections import deque
+
+from packed_state import (BLANK_BITS, LEFT_RABBIT, RIGHT_RABBIT, MoveTable, compact_state, expand_state,
+                          reconstruct_path)
+
+
+def rabbit_configurations(rabbits_per_side):
+    start_config = (-1,) * rabbits_per_side + (0,) + (1,) * rabbits_per_side
+    return start_config, start_config[::-1]
+
+
+class RabbitSearchEngine:
+    def __init__(self, start_config, goal_config):
+        self.start_config = tuple(start_config)
+        self.goal_config = tuple(goal_config)
+        self.length = len(self.start_config)
+        self.moves = MoveTable(self.length)
+        self.start = compact_state(self.start_config)
+        self.goal = compact_state(self.goal_config)
+        self.left_targets = [i for i, value in enumerate(self.goal_config) if value == -1]
+        self.right_targets = [i for i, value in enumerate(self.goal_config) if value == 1]
+        self.nodes_expanded = 0
+
+    @classmethod
+    def for_rabbits(cls, rabbits_per_side):
+        return cls(*rabbit_configurations(rabbits_per_side))
+
+    def search(self, method='bidirectional'):
+        methods = {
+            'bfs': self.breadth_first_search,
+            'bidirectional': self.bidirectional_search,
+            'astar': self.a_star_search,
+            'idastar': self.ida_star_search,
+        }
+        if method not in methods:
+            raise ValueError(f"Unknown search method: {method}")
+        self.nodes_expanded = 0
+        return methods[method]()
+
+    def successors(self, state):
+        self.nodes_expanded += 1
+        return self.moves.successors(state)
+
+    def predecessors(self, state):
+        self.nodes_expanded += 1
+        # Moves are one-way, so the goal side searches with the move table
+        # run backwards.
+        return self.moves.predecessors(state)
+
+    def displacement_heuristic(self, state):
+        # Rabbits of one colour are interchangeable, so matching them to their
+        # targets in order gives the smallest total displacement. A move shifts
+        # one rabbit by at most two cells, which keeps the estimate admissible.
+        board = state >> BLANK_BITS
+        left, right = [], []
+        for position in range(self.length):
+            cell = (board >> (2 * position)) & 3
+            if cell == LEFT_RABBIT:
+                left.append(position)
+            elif cell == RIGHT_RABBIT:
+                right.append(position)
+        if len(left) != len(self.left_targets) or len(right) != len(self.right_targets):
+            return float('inf')
+        displacement = sum(abs(a - b) for a, b in zip(left, self.left_targets))
+        displacement += sum(abs(a - b) for a, b in zip(right, self.right_targets))
+        return (displacement + 1) // 2
+
+    def breadth_first_search(self):
+        parents = {self.start: None}
+        if self.start == self.goal:
+            return reconstruct_path(parents, self.start, self.length)
+        queue = deque([self.start])
+
+        while queue:
+            current_state = queue.popleft()
+            for successor in self.successors(current_state):
+                if successor not in parents:
+                    parents[successor] = current_state
+                    if successor == self.goal:
+                        return reconstruct_path(parents, successor, self.length)
+                    queue.append(successor)
+
+        return None
+
+    def bidirectional_search(self):
+        forward_parents = {self.start: None}
+        backward_parents = {self.goal: None}
+        forward_depths = {self.start: 0}
+        backward_depths = {self.goal: 0}
+        forward_frontier = [self.start]
+        backward_frontier = [self.goal]
+
+        if self.start == self.goal:
+            return reconstruct_path(forward_parents, self.start, self.length)
+
+        while forward_frontier and backward_frontier:
+            # Always grow the smaller side by one whole layer; the first layer
+            # that touches the other side contains a shortest meeting point.
+            if len(forward_frontier) <= len(backward_frontier):
+                frontier, expand = forward_frontier, self.successors
+                parents, depths = forward_parents, forward_depths
+                other_depths = backward_depths
+            else:
+                frontier, expand = backward_frontier, self.predecessors
+                parents, depths = backward_parents, backward_depths
+                other_depths = forward_depths
+
+            next_frontier = []
+            best_meeting, best_length = None, None
+            for state in frontier:
+                depth = depths[state] + 1
+                for neighbour in expand(state):
+                    if neighbour not in parents:
+                        parents[neighbour] = state
+                        depths[neighbour] = depth
+                        next_frontier.append(neighbour)
+                    if neighbour in other_depths:
+                        length = depths[neighbour] + other_depths[neighbour]
+                        if best_length is None or length < best_length:
+                            best_meeting, best_length = neighbour, length
+
+            if best_meeting is not None:
+                return self._join_paths(forward_parents, backward_parents, best_meeting)
+
+            if frontier is forward_frontier:
+                forward_frontier = next_frontier
+            else:
+                backward_frontier = next_frontier
+
+        return None
+
+    def _join_paths(self, forward_parents, backward_parents, meeting_state):
+        path = reconstruct_path(forward_parents, meeting_state, self.length)
+        state = backward_parents[meeting_state]
+        while state is not None:
+            path.append(expand_state(state, self.length))
+            state = backward_parents[state]
+        return path
+
+    def a_star_search(self):
+        parents = {self.start: None}
+        costs = {self.start: 0}
+        # Ties on f are broken towards deeper states, which reach the goal sooner.
+        open_heap = [(self.displacement_heuristic(self.start), 0, self.start)]
+
+        while open_heap:
+            _, negative_cost, current_state = heapq.heappop(open_heap)
+            cost = -negative_cost
+            if cost > costs[current_state]:
+                continue
+            if current_state == self.goal:
+                return reconstruct_path(parents, current_state, self.length)
+
+            for successor in self.successors(current_state):
+                new_cost = cost + 1
+                if successor not in costs or new_cost < costs[successor]:
+                    costs[successor] = new_cost
+                    parents[successor] = current_state
+                    estimate = new_cost + self.displacement_heuristic(successor)
+                    heapq.heappush(open_heap, (estimate, -new_cost, successor))
+
+        return None
+
+    def ida_star_search(self):
+        if self.start == self.goal:
+            return [self.start_config]
+        threshold = self.displacement_heuristic(self.start)
+
+        while True:
+            path, threshold = self._bounded_search(threshold)
+            if path is not None:
+                return [expand_state(state, self.length) for state in path]
+            if threshold == float('inf'):
+                return None
+
+    def _bounded_search(self, threshold):
+        # Depth-first search limited to f <= threshold, kept iterative so deep
+        # boards do not hit the recursion limit. Returns the solution path, or
+        # None and the smallest f that exceeded the threshold.
+        path = [self.start]
+        stack = [iter(self._ordered_successors(self.start))]
+        next_threshold = float('inf')
+
+        while stack:
+            entry = next(stack[-1], None)
+            if entry is None:
+                stack.pop()
+                path.pop()
+                continue
+
+            heuristic, successor = entry
+            estimate = len(path) + heuristic
+            if estimate > threshold:
+                next_threshold = min(next_threshold, estimate)
+                continue
+            path.append(successor)
+            if successor == self.goal:
+                return path, threshold
+            stack.append(iter(self._ordered_successors(successor)))
+
+        return None, next_threshold
+
+    def _ordered_successors(self, state):
+        return sorted((self.displacement_heuristic(successor), successor) for successor in self.successors(state))
@@ -0,0 +1,65 @@
+import argparse
+import random
+import time
+
+import numpy as np
+
+from lab2 import similarity_matrix, similarity_score, top_k_similar
+
+def synthetic_corpus(documents, words_per_document, vocabulary_size, seed):
+    """Generate documents drawn from a Zipf-like vocabulary."""
+    generator = random.Random(seed)
+    vocabulary = [f"word{i}" for i in range(vocabulary_size)]
+    weights = [1 / (rank + 1) for rank in range(vocabulary_size)]
+    return [' '.join(generator.choices(vocabulary, weights, k=words_per_document)) for _ in range(documents)]
+
+def time_pairwise(texts, max_pairs, seed):
+    """Time the pairwise similarity_score loop, extrapolating from a sample of pairs on large corpora."""
+    n = len(texts)
+    total_pairs = n * (n - 1) // 2
+    if total_pairs <= max_pairs:
+        pairs = [(i, j) for i in range(n) for j in range(i + 1, n)]
+    else:
+        generator = random.Random(seed)
+        pairs = [tuple(generator.sample(range(n), 2)) for _ in range(max_pairs)]
+    start_time = time.perf_counter()
+    for i, j in pairs:
+        similarity_score(texts[i], texts[j])
+    elapsed = time.perf_counter() - start_time
+    return elapsed * total_pairs / len(pairs), len(pairs) < total_pairs
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the sparse all-pairs similarity matrix.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000])
+    parser.add_argument('--words', type=int, default=300)
+    parser.add_argument('--vocabulary', type=int, default=50000)
+    parser.add_argument('--block-size', type=int, default=1000)
+    parser.add_argument('--max-pairs', type=int, default=200000)
+    parser.add_argument('--dense-limit', type=int, default=5000,
+                        help="largest corpus to build the full dense matrix for")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    for n in args.sizes:
+        texts = synthetic_corpus(n, args.words, args.vocabulary, args.seed)
+        pairwise_seconds, extrapolated = time_pairwise(texts, args.max_pairs, args.seed)
+
+        matrix_seconds = None
+        if n <= args.dense_limit:
+            start_time = time.perf_counter()
+            matrix = similarity_matrix(texts, args.block_size)
+            matrix_seconds = time.perf_counter() - start_time
+            assert np.isclose(matrix[0, 1], similarity_score(texts[0], texts[1]))
+
+        start_time = time.perf_counter()
+        top_k_similar(texts, k=5, block_size=args.block_size)
+        top_k_seconds = time.perf_counter() - start_time
+
+        label = " (extrapolated)" if extrapolated else ""
+        print(f"n={n}: pairwise loop {pairwise_seconds:.2f} s{label}")
+        if matrix_seconds is not None:
+            print(f"n={n}: dense matrix {matrix_seconds:.2f} s ({pairwise_seconds / matrix_seconds:.1f}x)")
+        print(f"n={n}: top-5 per document {top_k_seconds:.2f} s ({pairwise_seconds / top_k_seconds:.1f}x)")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,127 @@
+import hashlib
+import os
+import struct
+from collections import OrderedDict
+
+import numpy as np
+
+from lab2 import stream_fingerprint
+
+MAGIC = b'FPC1'
+HEADER = struct.Struct('<4sIBI')
+ENTRY = struct.Struct('<HqQ32sQQ')
+
+def content_hash(file_path, chunk_size=1 << 20):
+    """Return the SHA-256 digest of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as file:
+        for chunk in iter(lambda: file.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.digest()
+
+class CacheEntry:
+    """Fingerprint of one document together with the file state it was computed from."""
+
+    __slots__ = ('size', 'mtime_ns', 'digest', 'word_count', 'hashes')
+
+    def __init__(self, size, mtime_ns, digest, word_count, hashes):
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.digest = digest
+        self.word_count = word_count
+        self.hashes = hashes
+
+    @property
+    def nbytes(self):
+        return ENTRY.size + self.hashes.nbytes
+
+class FingerprintCache:
+    """On-disk, size-limited LRU cache of document fingerprints keyed by path, size, mtime and content hash."""
+
+    def __init__(self, cache_path, max_bytes=64 << 20, shingle_size=1, normalize=False, chunk_size=1 << 20):
+        self.cache_path = cache_path
+        self.max_bytes = max_bytes
+        self.shingle_size = shingle_size
+        self.normalize = normalize
+        self.chunk_size = chunk_size
+        self.entries = OrderedDict()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.load()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def load(self):
+        """Read every cached fingerprint from the cache file in one pass."""
+        self.entries.clear()
+        self.total_bytes = 0
+        if not os.path.exists(self.cache_path):
+            return
+        with open(self.cache_path, 'rb') as file:
+            data = file.read()
+        if len(data) < HEADER.size:
+            return
+        magic, shingle_size, normalize, count = HEADER.unpack_from(data, 0)
+        # Fingerprints made with other tokenizer settings are not comparable.
+        if magic != MAGIC or shingle_size != self.shingle_size or bool(normalize) != self.normalize:
+            return
+
+        offset = HEADER.size
+        for _ in range(count):
+            path_length, mtime_ns, size, digest, word_count, hash_count = ENTRY.unpack_from(data, offset)
+            offset += ENTRY.size
+            path = data[offset:offset + path_length].decode('utf-8')
+            offset += path_length
+            hashes = np.frombuffer(data, dtype='<u8', count=hash_count, offset=offset).copy()
+            offset += hashes.nbytes
+            self._store(path, CacheEntry(size, mtime_ns, digest, word_count, hashes))
+
+    def save(self):
+        """Write the cache file, least recently used entries first."""
+        temporary_path = self.cache_path + '.tmp'
+        with open(temporary_path, 'wb') as file:
+            file.write(HEADER.pack(MAGIC, self.shingle_size, self.normalize, len(self.entries)))
+            for path, entry in self.entries.items():
+                encoded_path = path.encode('utf-8')
+                file.write(ENTRY.pack(len(encoded_path), entry.mtime_ns, entry.size, entry.digest,
+                                      entry.word_count, len(entry.hashes)))
+                file.write(encoded_path)
+                file.write(entry.hashes.astype('<u8', copy=False).tobytes())
+        os.replace(temporary_path, self.cache_path)
+
+    def _store(self, path, entry):
+        if path in self.entries:
+            self.total_bytes -= self.entries.pop(path).nbytes
+        self.entries[path] = entry
+        self.total_bytes += entry.nbytes
+        while self.total_bytes > self.max_bytes and len(self.entries) > 1:
+            _, evicted = self.entries.popitem(last=False)
+            self.total_bytes -= evicted.nbytes
+
+    def get(self, file_path):
+        """Return the (hash set, word count) fingerprint of a file, tokenizing it only if it changed."""
+        path = os.path.abspath(file_path)
+        status = os.stat(path)
+        entry = self.entries.get(path)
+
+        if entry is not None and entry.size == status.st_size and entry.mtime_ns == status.st_mtime_ns:
+            self.hits += 1
+            self.entries.move_to_end(path)
+            return set(entry.hashes.tolist()), entry.word_count
+
+        digest = content_hash(path, self.chunk_size)
+        if entry is not None and entry.size == status.st_size and entry.digest == digest:
+            # Touched but unchanged: keep the fingerprint and remember the new mtime.
+            self.hits += 1
+            entry.mtime_ns = status.st_mtime_ns
+            self.entries.move_to_end(path)
+            return set(entry.hashes.tolist()), entry.word_count
+
+        self.misses += 1
+        hashes, word_count = stream_fingerprint(path, self.shingle_size, self.chunk_size, self.normalize)
+        array = np.fromiter(hashes, dtype=np.uint64, count=len(hashes))
+        array.sort()
+        self._store(path, CacheEntry(status.st_size, status.st_mtime_ns, digest, word_count, array))
+        return hashes, word_count
@@ -1,10 +1,73 @@
+import codecs
+import hashlib
+import re
+from collections import deque
+
 import numpy as np
+from scipy import sparse
 
 def load_text(file_path):
     """Load text from a file."""
     with open(file_path, 'r') as file:
         return file.read()
 
+WORD_PATTERN = re.compile(r"\w+")
+
+def iter_tokens(file_path, chunk_size=1 << 20, normalize=False):
+    """Yield the words of a file while reading it in fixed-size chunks."""
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    carry = ''
+    with open(file_path, 'rb') as file:
+        while True:
+            chunk = file.read(chunk_size)
+            text = carry + decoder.decode(chunk, final=not chunk)
+            carry = ''
+            if normalize:
+                # Lowercasing can add code points ('İ' -> 'i' + U+0307), so the end is checked on the lowered text.
+                lowered = text.lower()
+                tokens = WORD_PATTERN.findall(lowered)
+                partial = bool(chunk) and bool(lowered) and WORD_PATTERN.match(lowered[-1]) is not None
+            else:
+                tokens = text.split()
+                partial = bool(chunk) and bool(text) and not text[-1].isspace()
+            # A word that touches the end of the chunk may continue in the next one.
+            if partial and tokens:
+                carry = tokens.pop()
+            yield from tokens
+            if not chunk:
+                break
+
+def stream_fingerprint(file_path, shingle_size=1, chunk_size=1 << 20, normalize=False):
+    """Return the set of stable shingle hashes of a file and its word count, without loading the file."""
+    hashes = set()
+    word_count = 0
+    window = deque(maxlen=shingle_size)
+    for token in iter_tokens(file_path, chunk_size, normalize):
+        word_count += 1
+        window.append(token)
+        if len(window) == shingle_size:
+            hashes.add(stable_hash(' '.join(window)))
+    if 0 < word_count < shingle_size:
+        hashes.add(stable_hash(' '.join(window)))
+    return hashes, word_count
+
+def fingerprint_similarity(fingerprint_a, fingerprint_b):
+    """Calculate the similarity score from two (hash set, word count) fingerprints."""
+    hashes_a, count_a = fingerprint_a
+    hashes_b, count_b = fingerprint_b
+    common = len(hashes_a & hashes_b)
+    denominator = count_a + count_b - common
+    return common / denominator if denominator else 0.0
+
+def file_similarity_score(path_a, path_b, shingle_size=1, chunk_size=1 << 20, normalize=False):
+    """Calculate the similarity score of two files by streaming them."""
+    return fingerprint_similarity(stream_fingerprint(path_a, shingle_size, chunk_size, normalize),
+                                  stream_fingerprint(path_b, shingle_size, chunk_size, normalize))
+
+def stable_hash(token):
+    """Hash a token to a 64-bit integer that stays the same across runs."""
+    return int.from_bytes(hashlib.blake2b(token.encode('utf-8'), digest_size=8).digest(), 'little')
+
 def similarity_score(text1, text2):
     """Calculate the similarity score between two texts."""
     words1 = text1.split()
@@ -12,21 +75,80 @@ def similarity_score(text1, text2):
     common_words = set(words1) & set(words2)
     return len(common_words) / (len(words1) + len(words2) - len(common_words))
 
+def build_incidence_matrix(texts):
+    """Build a sparse document-term incidence matrix and the word count of every document."""
+    vocabulary = {}
+    indptr = [0]
+    indices = []
+    word_counts = np.zeros(len(texts), dtype=np.int64)
+    for row, text in enumerate(texts):
+        words = text.split()
+        word_counts[row] = len(words)
+        indices.extend(vocabulary.setdefault(word, len(vocabulary)) for word in set(words))
+        indptr.append(len(indices))
+    data = np.ones(len(indices), dtype=np.int32)
+    incidence = sparse.csr_matrix((data, indices, indptr), shape=(len(texts), len(vocabulary)))
+    return incidence, word_counts
+
+def iter_similarity_blocks(texts, block_size=1000):
+    """Yield (start, block) row blocks of the matrix of similarity_score over all pairs."""
+    incidence, word_counts = build_incidence_matrix(texts)
+    transposed = incidence.T.tocsc()
+    for start in range(0, len(texts), block_size):
+        stop = min(start + block_size, len(texts))
+        common = (incidence[start:stop] @ transposed).toarray().astype(np.float64)
+        denominator = word_counts[start:stop, np.newaxis] + word_counts[np.newaxis, :] - common
+        block = np.divide(common, denominator, out=np.zeros_like(common), where=denominator > 0)
+        yield start, block
+
+def similarity_matrix(texts, block_size=1000):
+    """Return the dense n x n matrix of similarity_score over all pairs of texts."""
+    matrix = np.empty((len(texts), len(texts)))
+    for start, block in iter_similarity_blocks(texts, block_size):
+        matrix[start:start + len(block)] = block
+    return matrix
+
+def top_k_similar(texts, k=5, block_size=1000):
+    """Return the indices and scores of the k most similar other texts for every text."""
+    n = len(texts)
+    k = max(min(k, n - 1), 0)
+    top_indices = np.empty((n, k), dtype=np.int64)
+    top_scores = np.empty((n, k))
+    if k <= 0:
+        return top_indices, top_scores
+    for start, block in iter_similarity_blocks(texts, block_size):
+        rows = np.arange(len(block))
+        block[rows, start + rows] = -np.inf
+        candidates = np.argpartition(-block, k - 1, axis=1)[:, :k]
+        scores = np.take_along_axis(block, candidates, axis=1)
+        order = np.argsort(-scores, axis=1, kind='stable')
+        top_indices[start:start + len(block)] = np.take_along_axis(candidates, order, axis=1)
+        top_scores[start:start + len(block)] = np.take_along_axis(scores, order, axis=1)
+    return top_indices, top_scores
+
 def detect_plagiarism(doc_a, doc_b, threshold=0.3):
     """Detect plagiarism between two documents based on a similarity score."""
     score = similarity_score(doc_a, doc_b)
     return score > threshold, score
 
+def detect_plagiarism_fingerprints(fingerprint_a, fingerprint_b, threshold=0.3):
+    """Detect plagiarism between two documents from their (hash set, word count) fingerprints."""
+    score = fingerprint_similarity(fingerprint_a, fingerprint_b)
+    return score > threshold, score
+
 def main():
     """Main function to load documents and check for plagiarism."""
-   
-    doc_a = load_text('document_a.txt')
-    doc_b = load_text('document_b.txt')
-    doc_c = load_text('document_c.txt')
+    from fingerprint_cache import FingerprintCache
 
-   
-    result_ab, score_ab = detect_plagiarism(doc_a, doc_b)
-    result_ac, score_ac = detect_plagiarism(doc_a, doc_c)
+    # Fingerprints are cached between runs; only new or changed documents are re-tokenized.
+    cache = FingerprintCache('fingerprints.cache')
+    doc_a = cache.get('document_a.txt')
+    doc_b = cache.get('document_b.txt')
+    doc_c = cache.get('document_c.txt')
+    cache.save()
+
+    result_ab, score_ab = detect_plagiarism_fingerprints(doc_a, doc_b)
+    result_ac, score_ac = detect_plagiarism_fingerprints(doc_a, doc_c)
 
    
     print(f"Document A and Document B Plagiarized: {result_ab}, Similarity Score: {score_ab:.2f}")
@@ -0,0 +1,183 @@
+import pickle
+from collections import defaultdict
+from itertools import combinations
+
+import numpy as np
+
+from lab2 import stable_hash
+
+MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+MAX_HASH = np.uint64((1 << 32) - 1)
+
+def shingle_hashes(text, shingle_size=1):
+    """Return the distinct 32-bit hashes of the word shingles in a text."""
+    words = text.split()
+    if len(words) <= shingle_size:
+        shingles = {' '.join(words)} if words else set()
+    else:
+        shingles = {' '.join(words[i:i + shingle_size]) for i in range(len(words) - shingle_size + 1)}
+    return np.fromiter((stable_hash(shingle) & 0xFFFFFFFF for shingle in shingles),
+                       dtype=np.uint64, count=len(shingles))
+
+def word_profile(text):
+    """Return the sorted distinct 64-bit word hashes and the word count of a text, all that scoring needs."""
+    words = text.split()
+    hashes = np.unique(np.fromiter((stable_hash(word) for word in words), dtype=np.uint64, count=len(words)))
+    return hashes, len(words)
+
+def profile_similarity(profile_a, profile_b):
+    """Calculate similarity_score from two word profiles; 0.0 when both documents are empty."""
+    hashes_a, count_a = profile_a
+    hashes_b, count_b = profile_b
+    common = np.intersect1d(hashes_a, hashes_b, assume_unique=True).size
+    denominator = count_a + count_b - common
+    return common / denominator if denominator else 0.0
+
+def _probability_integral(probability, low, high, steps=100):
+    """Integrate a collision probability curve over [low, high] with the midpoint rule."""
+    width = (high - low) / steps
+    points = low + width * (np.arange(steps) + 0.5)
+    return float(np.sum(probability(points)) * width)
+
+def lsh_parameters(threshold, num_perm, false_positive_weight=0.5, false_negative_weight=0.5):
+    """Pick the (bands, rows) split of num_perm that best separates pairs around a threshold."""
+    best, best_error = None, None
+    for bands in range(1, num_perm + 1):
+        rows = num_perm // bands
+        if rows == 0:
+            break
+        collision = lambda s, b=bands, r=rows: 1 - (1 - s ** r) ** b
+        false_positive = _probability_integral(collision, 0.0, threshold)
+        false_negative = _probability_integral(lambda s: 1 - collision(s), threshold, 1.0)
+        error = false_positive_weight * false_positive + false_negative_weight * false_negative
+        if best_error is None or error < best_error:
+            best, best_error = (bands, rows), error
+    return best
+
+class PlagiarismIndex:
+    """MinHash signatures bucketed by LSH bands, confirmed with the exact similarity score."""
+
+    def __init__(self, num_perm=128, threshold=0.3, shingle_size=1, bands=None, rows=None,
+                 false_positive_weight=0.5, false_negative_weight=0.5, seed=1):
+        if bands is None or rows is None:
+            bands, rows = lsh_parameters(threshold, num_perm, false_positive_weight, false_negative_weight)
+        if bands * rows > num_perm:
+            raise ValueError("bands * rows must not exceed num_perm")
+        self.num_perm = num_perm
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+        self.bands = bands
+        self.rows = rows
+        self.seed = seed
+        generator = np.random.default_rng(seed)
+        self._a = generator.integers(1, 1 << 32, size=(num_perm, 1), dtype=np.uint64)
+        self._b = generator.integers(0, 1 << 32, size=(num_perm, 1), dtype=np.uint64)
+        self.signatures = {}
+        # Word profiles instead of full texts keep memory and the saved index small.
+        self.profiles = {}
+        self._buckets = [defaultdict(list) for _ in range(bands)]
+
+    def __len__(self):
+        return len(self.profiles)
+
+    def __contains__(self, doc_id):
+        return doc_id in self.profiles
+
+    def signature(self, text):
+        """Compute the MinHash signature of a text."""
+        hashes = shingle_hashes(text, self.shingle_size)
+        if hashes.size == 0:
+            return np.full(self.num_perm, MAX_HASH, dtype=np.uint64)
+        # a, b and the hashes are all below 2**32, so a * h + b cannot overflow.
+        permuted = (self._a * hashes[np.newaxis, :] + self._b) % MERSENNE_PRIME
+        return (permuted & MAX_HASH).min(axis=1)
+
+    def _band_keys(self, signature):
+        # A document without shingles has the all-MAX_HASH signature; it is kept out of the bands,
+        # where every such document would collide with every other.
+        if (signature == MAX_HASH).all():
+            return []
+        return [signature[band * self.rows:(band + 1) * self.rows].tobytes() for band in range(self.bands)]
+
+    def add(self, doc_id, text):
+        """Add a document to the index."""
+        if doc_id in self.profiles:
+            raise KeyError(f"Document {doc_id!r} is already indexed")
+        self._insert(doc_id, self.signature(text), word_profile(text))
+
+    def _insert(self, doc_id, signature, profile):
+        self.signatures[doc_id] = signature
+        self.profiles[doc_id] = profile
+        for bucket, key in zip(self._buckets, self._band_keys(signature)):
+            bucket[key].append(doc_id)
+
+    def candidates(self, text):
+        """Return the ids of indexed documents that share at least one LSH band with a text."""
+        found = set()
+        for bucket, key in zip(self._buckets, self._band_keys(self.signature(text))):
+            found.update(bucket.get(key, ()))
+        return found
+
+    def estimate(self, doc_id_a, doc_id_b):
+        """Estimate the shingle Jaccard similarity of two indexed documents from their signatures."""
+        return float(np.mean(self.signatures[doc_id_a] == self.signatures[doc_id_b]))
+
+    def query(self, text, threshold=None):
+        """Return (doc_id, score) for indexed documents whose exact score exceeds the threshold."""
+        threshold = self.threshold if threshold is None else threshold
+        matches = []
+        profile = word_profile(text)
+        for doc_id in self.candidates(text):
+            score = profile_similarity(profile, self.profiles[doc_id])
+            if score > threshold:
+                matches.append((doc_id, score))
+        return sorted(matches, key=lambda match: match[1], reverse=True)
+
+    def candidate_pairs(self):
+        """Return every pair of indexed documents that share at least one LSH band."""
+        pairs = set()
+        for bucket in self._buckets:
+            for doc_ids in bucket.values():
+                if len(doc_ids) > 1:
+                    pairs.update(combinations(doc_ids, 2))
+        return pairs
+
+    def all_pairs(self, threshold=None):
+        """Return (doc_id_a, doc_id_b, score) for all indexed pairs whose exact score exceeds the threshold."""
+        threshold = self.threshold if threshold is None else threshold
+        matches = []
+        for doc_id_a, doc_id_b in self.candidate_pairs():
+            score = profile_similarity(self.profiles[doc_id_a], self.profiles[doc_id_b])
+            if score > threshold:
+                matches.append((doc_id_a, doc_id_b, score))
+        return sorted(matches, key=lambda match: match[2], reverse=True)
+
+    def save(self, path):
+        """Write the index to disk."""
+        doc_ids = list(self.profiles)
+        state = {
+            'num_perm': self.num_perm,
+            'threshold': self.threshold,
+            'shingle_size': self.shingle_size,
+            'bands': self.bands,
+            'rows': self.rows,
+            'seed': self.seed,
+            'doc_ids': doc_ids,
+            'profiles': [self.profiles[doc_id] for doc_id in doc_ids],
+            'signatures': np.stack([self.signatures[doc_id] for doc_id in doc_ids]) if doc_ids else None,
+        }
+        with open(path, 'wb') as file:
+            pickle.dump(state, file, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, path):
+        """Read an index written by save()."""
+        with open(path, 'rb') as file:
+            state = pickle.load(file)
+        index = cls(num_perm=state['num_perm'], threshold=state['threshold'], shingle_size=state['shingle_size'],
+                    bands=state['bands'], rows=state['rows'], seed=state['seed'])
+        for position, doc_id in enumerate(state['doc_ids']):
+            # Indexes saved before profiles replaced texts still load.
+            profile = state['profiles'][position] if 'profiles' in state else word_profile(state['texts'][position])
+            index._insert(doc_id, state['signatures'][position], profile)
+        return index
@@ -0,0 +1,22 @@
+from lab2 import WORD_PATTERN, iter_tokens
+
+def write(tmp_path, text):
+    path = tmp_path / 'document.txt'
+    path.write_text(text, encoding='utf-8')
+    return str(path)
+
+def test_chunked_tokens_match_whole_file(tmp_path):
+    text = 'alpha beta\ngamma  delta épsilon\n'
+    path = write(tmp_path, text)
+    for chunk_size in (1, 2, 3, 7, 1 << 20):
+        assert list(iter_tokens(path, chunk_size)) == text.split()
+        assert list(iter_tokens(path, chunk_size, normalize=True)) == WORD_PATTERN.findall(text.lower())
+
+def test_chunk_boundary_when_lowercasing_adds_code_points(tmp_path):
+    # 'İ' lowercases to 'i' + U+0307, and U+0307 is not a word character.
+    text = ', \n \n.éb\na. İa\n,éİ'
+    path = write(tmp_path, text)
+    expected = WORD_PATTERN.findall(text.lower())
+    assert expected == ['éb', 'a', 'i', 'a', 'éi']
+    for chunk_size in (1, 2, 3, 5, 1 << 20):
+        assert list(iter_tokens(path, chunk_size, normalize=True)) == expected
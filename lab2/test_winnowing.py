@@ -0,0 +1,54 @@
+import random
+
+from winnowing import WinnowingIndex, normalize_with_offsets
+
+def random_words(rng, count):
+    return ' '.join(''.join(rng.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(rng.randint(3, 8)))
+                    for _ in range(count))
+
+def test_offsets_stay_aligned_when_lowercasing_adds_code_points():
+    # 'İ' lowercases to 'i' + U+0307; both code points map back to the same character.
+    normalized, offsets = normalize_with_offsets('İİİİİİ abcdefghij')
+    assert len(normalized) == len(offsets)
+    assert offsets[:4].tolist() == [0, 0, 1, 1]
+
+    index = WinnowingIndex(k=5, window=4)
+    text = 'İİİİİİ abcdefghij'
+    index.add('a', text)
+    span = index.query(text)[0]
+    assert (span.query_start, span.query_end) == (span.doc_start, span.doc_end)
+    assert 0 <= span.query_start < span.query_end <= len(text)
+
+def test_shared_passage_is_reported_at_its_offsets():
+    rng = random.Random(0)
+    passage = random_words(rng, 80)
+    document = random_words(rng, 200) + ' ' + passage + ' ' + random_words(rng, 100)
+    query = random_words(rng, 50) + ' ' + passage + ' ' + random_words(rng, 150)
+    index = WinnowingIndex(k=10, window=8)
+    index.add('doc', document)
+    index.add('other', random_words(rng, 300))
+
+    spans = index.query(query)
+    assert spans and all(span.doc_id == 'doc' for span in spans)
+    span = spans[0]
+    query_start, doc_start = query.index(passage), document.index(passage)
+    # The first and last fingerprints of the passage lie within k + window characters of its ends.
+    slack = index.k + index.window
+    assert query_start <= span.query_start <= query_start + slack
+    assert query_start + len(passage) - slack <= span.query_end <= query_start + len(passage)
+    assert span.doc_start - doc_start == span.query_start - query_start
+    assert query[span.query_start:span.query_end] == document[span.doc_start:span.doc_end]
+
+def test_separate_passages_on_one_diagonal_stay_apart():
+    rng = random.Random(1)
+    first, second = random_words(rng, 40), random_words(rng, 40)
+    # Fillers of equal length but no shared grams put both passages on one diagonal, far apart.
+    filler_document = random_words(rng, 60)
+    filler_query = filler_document.translate(str.maketrans('abcdefghijklmnopqrstuvwxyz', 'zabcdefghijklmnopqrstuvwxy'))
+    document = first + ' ' + filler_document + ' ' + second
+    query = first + ' ' + filler_query + ' ' + second
+    index = WinnowingIndex(k=8, window=4)
+    index.add('doc', document)
+    spans = index.query(query)
+    assert len(spans) == 2
+    assert all(span.doc_start - span.query_start == 0 for span in spans)
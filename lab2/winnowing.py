@@ -0,0 +1,126 @@
+from collections import defaultdict, deque, namedtuple
+
+import numpy as np
+
+HASH_MODULUS = (1 << 61) - 1
+HASH_BASE = 1000003
+
+MatchSpan = namedtuple('MatchSpan', ['doc_id', 'query_start', 'query_end', 'doc_start', 'doc_end', 'fingerprints'])
+
+def normalize_with_offsets(text):
+    """Lowercase a text, keep only alphanumeric characters and remember where each one came from."""
+    characters = []
+    offsets = []
+    for offset, character in enumerate(text):
+        if character.isalnum():
+            # Some characters lowercase to several code points ('İ' -> 'i̇'); each one maps back to the same offset.
+            for lowered in character.lower():
+                characters.append(lowered)
+                offsets.append(offset)
+    return ''.join(characters), np.array(offsets, dtype=np.int64)
+
+def kgram_hashes(text, k):
+    """Return the rolling hash of every k-character gram of a text."""
+    if len(text) < k:
+        return []
+    high_power = pow(HASH_BASE, k - 1, HASH_MODULUS)
+    value = 0
+    for character in text[:k]:
+        value = (value * HASH_BASE + ord(character)) % HASH_MODULUS
+    hashes = [value]
+    for position in range(k, len(text)):
+        value = (value - ord(text[position - k]) * high_power) % HASH_MODULUS
+        value = (value * HASH_BASE + ord(text[position])) % HASH_MODULUS
+        hashes.append(value)
+    return hashes
+
+def winnow(hashes, window):
+    """Select (hash, position) fingerprints: the rightmost minimum of every window of hashes."""
+    if not hashes:
+        return []
+    if len(hashes) < window:
+        position = min(range(len(hashes)), key=lambda i: (hashes[i], -i))
+        return [(hashes[position], position)]
+
+    fingerprints = []
+    candidates = deque()
+    for position, value in enumerate(hashes):
+        # Keep candidate positions with strictly increasing hashes; the front
+        # is the rightmost minimum of the current window.
+        while candidates and hashes[candidates[-1]] >= value:
+            candidates.pop()
+        candidates.append(position)
+        if candidates[0] <= position - window:
+            candidates.popleft()
+        if position >= window - 1:
+            selected = candidates[0]
+            if not fingerprints or fingerprints[-1][1] != selected:
+                fingerprints.append((hashes[selected], selected))
+    return fingerprints
+
+class WinnowingIndex:
+    """Inverted index of winnowed k-gram fingerprints that reports matching passages with character offsets."""
+
+    def __init__(self, k=25, window=20):
+        self.k = k
+        self.window = window
+        self.postings = defaultdict(list)
+        self.offsets = {}
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def fingerprint(self, text):
+        """Return the winnowed fingerprints of a text and the original offset of every normalized character."""
+        normalized, offsets = normalize_with_offsets(text)
+        return winnow(kgram_hashes(normalized, self.k), self.window), offsets
+
+    def add(self, doc_id, text):
+        """Add a document to the index."""
+        if doc_id in self.offsets:
+            raise KeyError(f"Document {doc_id!r} is already indexed")
+        fingerprints, offsets = self.fingerprint(text)
+        self.offsets[doc_id] = offsets
+        for value, position in fingerprints:
+            self.postings[value].append((doc_id, position))
+
+    def query(self, text, min_fingerprints=1):
+        """Return the passages shared by a text and the indexed documents, longest first."""
+        fingerprints, query_offsets = self.fingerprint(text)
+        matches = defaultdict(list)
+        for value, query_position in fingerprints:
+            for doc_id, doc_position in self.postings.get(value, ()):
+                matches[doc_id].append((query_position, doc_position))
+
+        spans = []
+        for doc_id, pairs in matches.items():
+            for query_first, query_last, doc_first, doc_last, count in self._merge(sorted(pairs)):
+                if count < min_fingerprints:
+                    continue
+                doc_offsets = self.offsets[doc_id]
+                spans.append(MatchSpan(
+                    doc_id,
+                    int(query_offsets[query_first]), int(query_offsets[query_last + self.k - 1]) + 1,
+                    int(doc_offsets[doc_first]), int(doc_offsets[doc_last + self.k - 1]) + 1,
+                    count))
+        return sorted(spans, key=lambda span: span.query_end - span.query_start, reverse=True)
+
+    def _merge(self, pairs):
+        # A copied passage keeps doc_position - query_position constant, so open
+        # spans are keyed by that diagonal. Winnowing guarantees a fingerprint at
+        # least every `window` grams of a shared passage, so hits on the same
+        # diagonal no more than k + window apart belong to the same passage.
+        # One dict lookup per hit keeps the pass linear.
+        max_gap = self.k + self.window
+        open_spans = {}
+        closed_spans = []
+        for query_position, doc_position in pairs:
+            diagonal = doc_position - query_position
+            span = open_spans.get(diagonal)
+            if span is not None and query_position - span[1] <= max_gap:
+                span[1], span[3], span[4] = query_position, doc_position, span[4] + 1
+                continue
+            if span is not None:
+                closed_spans.append(span)
+            open_spans[diagonal] = [query_position, query_position, doc_position, doc_position, 1]
+        return closed_spans + list(open_spans.values())
@@ -0,0 +1,55 @@
+import argparse
+import random
+import time
+
+from bitsliced import bitsliced_beam_search
+from lab3_a import beam_search, generate_k_sat
+from lab3_b import beam_search as dict_beam_search
+
+def time_per_iteration(search, k_sat, beam_width, iterations, seed):
+    """
+    Time a beam search run for a fixed number of iterations.
+
+    Parameters:
+    search (callable): Beam search function.
+    k_sat (list): The k-SAT problem as a list of clauses.
+    beam_width (int): The width of the beam.
+    iterations (int): Iterations to run.
+    seed (int): Seed for the global random generator.
+
+    Returns:
+    tuple: (seconds per iteration, solution or None).
+    """
+    random.seed(seed)
+    start_time = time.perf_counter()
+    solution = search(k_sat, beam_width=beam_width, max_iterations=iterations)
+    return (time.perf_counter() - start_time) / iterations, solution
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare dict, boolean-array and bit-sliced beam search.")
+    parser.add_argument('--variables', type=int, default=200)
+    parser.add_argument('--ratio', type=float, default=4.26)
+    parser.add_argument('--widths', type=int, nargs='+', default=[3, 32, 256, 1024])
+    parser.add_argument('--iterations', type=int, default=3)
+    parser.add_argument('--dict-limit', type=int, default=32,
+                        help="widest beam to run the dict-based version on")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    k_sat = generate_k_sat(3, int(args.ratio * args.variables), args.variables)
+    print(f"Instance: n={args.variables}, m={len(k_sat)}, {args.iterations} iterations per run")
+    print(f"{'width':>6} {'candidates':>11} {'dict':>12} {'bool array':>12} {'bit-sliced':>12} {'vs dict':>9} {'vs bool':>9}")
+
+    for width in args.widths:
+        bool_time, bool_solution = time_per_iteration(beam_search, k_sat, width, args.iterations, args.seed)
+        sliced_time, sliced_solution = time_per_iteration(bitsliced_beam_search, k_sat, width, args.iterations, args.seed)
+        assert bool_solution == sliced_solution, "bit-sliced search diverged from beam_search"
+        if width <= args.dict_limit:
+            dict_time, _ = time_per_iteration(dict_beam_search, k_sat, width, args.iterations, args.seed)
+            dict_text = f"{dict_time * 1e3:9.1f} ms"
+            dict_speedup = f"{dict_time / sliced_time:8.1f}x"
+        else:
+            dict_text, dict_speedup = f"{'-':>12}", f"{'-':>9}"
+        print(f"{width:>6} {width * args.variables:>11} {dict_text} {bool_time * 1e3:9.1f} ms "
+              f"{sliced_time * 1e3:9.1f} ms {dict_speedup} {bool_time / sliced_time:8.1f}x")
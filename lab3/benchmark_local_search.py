@@ -0,0 +1,96 @@
+import argparse
+import random
+import time
+
+from lab3_a import generate_k_sat, heuristic_satisfied_clauses
+from sat_state import SATState
+
+def time_rescan_flips(k_sat, solution, flips):
+    """
+    Time candidate flips evaluated the original way, by rescanning every clause.
+
+    Parameters:
+    k_sat (list): The k-SAT problem as a list of clauses.
+    solution (dict): Current variable assignments.
+    flips (int): Number of candidate flips to evaluate.
+
+    Returns:
+    float: Seconds per evaluated flip.
+    """
+    variables = list(solution.keys())
+    start_time = time.perf_counter()
+    for _ in range(flips):
+        var = random.choice(variables)
+        new_solution = solution.copy()
+        new_solution[var] = not new_solution[var]
+        heuristic_satisfied_clauses(new_solution, k_sat)
+    return (time.perf_counter() - start_time) / flips
+
+def time_incremental_sweep(k_sat, solution):
+    """
+    Time one variable neighborhood descent sweep on the incremental state.
+
+    Parameters:
+    k_sat (list): The k-SAT problem as a list of clauses.
+    solution (dict): Initial variable assignments.
+
+    Returns:
+    tuple: (build seconds, sweep seconds, flips accepted).
+    """
+    start_time = time.perf_counter()
+    state = SATState(k_sat, solution)
+    build_time = time.perf_counter() - start_time
+
+    accepted = 0
+    start_time = time.perf_counter()
+    for var in range(1, state.n + 1):
+        if state.score(var) > 0:
+            state.flip(var)
+            accepted += 1
+    return build_time, time.perf_counter() - start_time, accepted
+
+def time_incremental_flips(k_sat, solution, flips):
+    """
+    Time random flips applied to the incremental state, as hill climbing does.
+
+    Parameters:
+    k_sat (list): The k-SAT problem as a list of clauses.
+    solution (dict): Initial variable assignments.
+    flips (int): Number of flips to apply.
+
+    Returns:
+    float: Seconds per flip.
+    """
+    state = SATState(k_sat, solution)
+    variables = list(solution.keys())
+    start_time = time.perf_counter()
+    for _ in range(flips):
+        state.flip(random.choice(variables))
+    return (time.perf_counter() - start_time) / flips
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare clause rescanning with incremental make/break scoring.")
+    parser.add_argument('--variables', type=int, default=10000)
+    parser.add_argument('--clauses', type=int, default=42000)
+    parser.add_argument('--k', type=int, default=3)
+    parser.add_argument('--rescan-flips', type=int, default=20)
+    parser.add_argument('--flips', type=int, default=100000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    k_sat = generate_k_sat(args.k, args.clauses, args.variables)
+    n = max(abs(literal) for clause in k_sat for literal in clause)
+    solution = {var: random.choice([True, False]) for var in range(1, n + 1)}
+    print(f"Instance: n={n}, m={len(k_sat)}, k={args.k}")
+
+    rescan_per_flip = time_rescan_flips(k_sat, solution, args.rescan_flips)
+    incremental_per_flip = time_incremental_flips(k_sat, solution, args.flips)
+    build_time, sweep_time, accepted = time_incremental_sweep(k_sat, solution)
+
+    print(f"Rescan per flip:        {rescan_per_flip * 1e3:10.3f} ms")
+    print(f"Incremental per flip:   {incremental_per_flip * 1e3:10.3f} ms "
+          f"({rescan_per_flip / incremental_per_flip:,.0f}x)")
+    print(f"VND sweep, rescan:      {rescan_per_flip * n:10.1f} s (extrapolated from {args.rescan_flips} flips)")
+    print(f"VND sweep, incremental: {sweep_time:10.3f} s + {build_time:.3f} s setup, {accepted} flips accepted "
+          f"({rescan_per_flip * n / (sweep_time + build_time):,.0f}x)")
@@ -0,0 +1,150 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import time
+
+from cdcl import CDCLSolver
+from cnf import generate_cnf
+from dimacs import write_dimacs
+from walksat import walksat
+
+SOLVERS = ('walksat', 'probsat', 'cdcl')
+
+def run_solver(solver, k_sat, time_limit, max_conflicts):
+    """
+    Run one solver on one instance.
+
+    Parameters:
+    solver (str): 'walksat', 'probsat' or 'cdcl'.
+    k_sat (list): The k-SAT problem as a list of clauses.
+    time_limit (float): Wall-clock budget of the random-walk solvers in seconds.
+    max_conflicts (int): Conflict budget of CDCL.
+
+    Returns:
+    dict: status, seconds and, for the random-walk solvers, flips and flips_per_second.
+    """
+    start_time = time.perf_counter()
+    if solver == 'cdcl':
+        cdcl_solver = CDCLSolver(k_sat)
+        status, _ = cdcl_solver.solve(max_conflicts=max_conflicts)
+        return {'status': status, 'seconds': time.perf_counter() - start_time,
+                'conflicts': cdcl_solver.conflicts}
+    stats = {}
+    solution = walksat(k_sat, method=solver, max_flips=float('inf'), max_tries=1, time_limit=time_limit, seed=0,
+                       stats=stats)
+    return {'status': 'SAT' if solution is not None else 'UNKNOWN', 'seconds': time.perf_counter() - start_time,
+            'flips': stats['flips'], 'flips_per_second': stats['flips_per_second']}
+
+def summarize(runs):
+    """
+    Aggregate the runs of one solver on one (n, ratio) cell.
+
+    The median time-to-solution counts unsolved runs as infinitely slow, so it
+    is None once half of the runs fail.
+
+    Parameters:
+    runs (list): Results returned by run_solver.
+
+    Returns:
+    dict: success_rate, median_time_to_solution, median_flips_per_second and the runs.
+    """
+    times = [run['seconds'] if run['status'] in ('SAT', 'UNSAT') else float('inf') for run in runs]
+    solved = [value for value in times if value != float('inf')]
+    median_time = statistics.median(times)
+    rates = [run['flips_per_second'] for run in runs if 'flips_per_second' in run]
+    return {
+        'success_rate': len(solved) / len(runs),
+        'median_time_to_solution': median_time if median_time != float('inf') else None,
+        'median_flips_per_second': statistics.median(rates) if rates else None,
+        'runs': runs,
+    }
+
+def compare(results, baseline_path, tolerance):
+    """
+    Print the cells that got slower or solve fewer instances than a baseline results file.
+
+    Parameters:
+    results (list): Cells of the current run.
+    baseline_path (str): JSON file written by an earlier run.
+    tolerance (float): Allowed relative slowdown of the median time-to-solution.
+    """
+    with open(baseline_path) as file:
+        baseline = {(cell['solver'], cell['n'], cell['ratio']): cell for cell in json.load(file)['results']}
+    regressions = 0
+    for cell in results:
+        old = baseline.get((cell['solver'], cell['n'], cell['ratio']))
+        if old is None:
+            continue
+        old_time, new_time = old['median_time_to_solution'], cell['median_time_to_solution']
+        slower = old_time is not None and (new_time is None or new_time > old_time * (1 + tolerance))
+        if slower or cell['success_rate'] < old['success_rate']:
+            regressions += 1
+            print(f"REGRESSION {cell['solver']} n={cell['n']} m/n={cell['ratio']}: "
+                  f"success {old['success_rate']:.2f} -> {cell['success_rate']:.2f}, "
+                  f"median time {old_time} -> {new_time}")
+    print(f"{regressions} regressions against {baseline_path}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sweep random 3-SAT across the phase transition and record solver performance.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 10000, 100000])
+    parser.add_argument('--ratios', type=float, nargs='+', default=[3.8, 4.0, 4.1, 4.2, 4.26, 4.3, 4.4])
+    parser.add_argument('--k', type=int, default=3)
+    parser.add_argument('--instances', type=int, default=5)
+    parser.add_argument('--solvers', nargs='+', choices=SOLVERS, default=list(SOLVERS))
+    parser.add_argument('--time-limit', type=float, default=30.0,
+                        help="wall-clock budget per random-walk run in seconds")
+    parser.add_argument('--max-conflicts', type=int, default=100000)
+    parser.add_argument('--cdcl-limit', type=int, default=300,
+                        help="largest n to run the complete solver on")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--instance-dir', help="also write every instance there as DIMACS")
+    parser.add_argument('--output', default='phase_transition.json')
+    parser.add_argument('--baseline', help="earlier results file to check for regressions")
+    parser.add_argument('--tolerance', type=float, default=0.25)
+    args = parser.parse_args()
+
+    if args.instance_dir:
+        os.makedirs(args.instance_dir, exist_ok=True)
+    results = []
+    for n in args.sizes:
+        for ratio in args.ratios:
+            m = int(round(ratio * n))
+            runs = {solver: [] for solver in args.solvers}
+            for instance in range(args.instances):
+                # The instance seed depends only on the cell, so reruns see the same problems.
+                seed = [args.seed, args.k, n, m, instance]
+                cnf = generate_cnf(args.k, m, n, seed=seed)
+                if args.instance_dir:
+                    write_dimacs(os.path.join(args.instance_dir, f"uf{args.k}-{n}-{m}-{instance}.cnf"), cnf,
+                                 comments=[f"random {args.k}-SAT, seed {seed}"])
+                k_sat = cnf.to_clauses()
+                for solver in args.solvers:
+                    if solver == 'cdcl' and n > args.cdcl_limit:
+                        continue
+                    run = run_solver(solver, k_sat, args.time_limit, args.max_conflicts)
+                    runs[solver].append(dict(run, instance=instance, seed=seed))
+
+            for solver, solver_runs in runs.items():
+                if not solver_runs:
+                    continue
+                cell = dict(solver=solver, n=n, m=m, ratio=ratio, **summarize(solver_runs))
+                results.append(cell)
+                median_time = cell['median_time_to_solution']
+                rate = cell['median_flips_per_second']
+                print(f"n={n:>6} m/n={ratio:<5} {solver:>8}: success {cell['success_rate']:.2f}, "
+                      f"median time {'-' if median_time is None else f'{median_time:.3f} s':>10}"
+                      f"{'' if rate is None else f', {rate:,.0f} flips/s'}")
+
+    with open(args.output, 'w') as file:
+        json.dump({
+            'config': vars(args),
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'results': results,
+        }, file, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.baseline:
+        compare(results, args.baseline, args.tolerance)
@@ -0,0 +1,197 @@
+import random
+
+import numpy as np
+
+from cnf import CNF
+
+LANES = 64
+
+def pack_lanes(values):
+    """
+    Pack booleans along the last axis into uint64 words, 64 lanes per word.
+
+    Lane l sits in bit l % 64 of word l // 64. The last axis is padded with
+    False up to a multiple of 64.
+
+    Parameters:
+    values (array): Boolean array whose last axis holds the lanes.
+
+    Returns:
+    array: uint64 array with the last axis shrunk to ceil(lanes / 64).
+    """
+    values = np.asarray(values, dtype=bool)
+    padding = -values.shape[-1] % LANES
+    if padding:
+        values = np.concatenate([values, np.zeros(values.shape[:-1] + (padding,), dtype=bool)], axis=-1)
+    packed = np.packbits(values, axis=-1, bitorder='little')
+    return np.ascontiguousarray(packed).view('<u8').astype(np.uint64, copy=False)
+
+def unpack_lanes(words, lanes=None):
+    """
+    Inverse of pack_lanes.
+
+    Parameters:
+    words (array): uint64 array whose last axis holds the packed words.
+    lanes (int): Number of lanes to keep, all of them if None.
+
+    Returns:
+    array: Boolean array with one entry per lane.
+    """
+    words = np.ascontiguousarray(words, dtype='<u8')
+    values = np.unpackbits(words.view(np.uint8), axis=-1, bitorder='little').astype(bool)
+    return values if lanes is None else values[..., :lanes]
+
+def count_lanes(bits):
+    """
+    Count the set bits of every lane over the rows of a packed bit matrix.
+
+    The rows are summed pairwise with bit-sliced ripple-carry adders, so every
+    step works on whole words and handles 64 lanes at once.
+
+    Parameters:
+    bits (array): r x W uint64 array, one packed row per clause.
+
+    Returns:
+    array: Number of rows with the bit set, for each of the 64 * W lanes.
+    """
+    # Bit planes of a column of numbers: number = sum(planes[i] << i).
+    planes = [np.asarray(bits, dtype=np.uint64)]
+    if not len(planes[0]):
+        return np.zeros(planes[0].shape[1] * LANES, dtype=np.int64)
+    while len(planes[0]) > 1:
+        if len(planes[0]) % 2:
+            planes = [np.concatenate([plane, np.zeros_like(plane[:1])]) for plane in planes]
+        carry = np.zeros_like(planes[0][::2])
+        summed = []
+        for plane in planes:
+            left, right = plane[::2], plane[1::2]
+            partial = left ^ right
+            summed.append(partial ^ carry)
+            carry = (left & right) | (carry & partial)
+        summed.append(carry)
+        planes = summed
+
+    counts = np.zeros(planes[0].shape[1] * LANES, dtype=np.int64)
+    for position, plane in enumerate(planes):
+        if plane.any():
+            counts += unpack_lanes(plane[0]).astype(np.int64) << position
+    return counts
+
+class BitSlicedCNF:
+    """
+    Evaluates up to 64 assignments per machine word.
+
+    Assignments are packed per variable: row v of the word matrix holds the
+    value of variable v in every lane. A clause is then satisfied in all lanes
+    of a word after k XORs (for negated literals) and k - 1 ORs.
+
+    Parameters:
+    cnf (CNF): The problem as a literal matrix.
+    """
+
+    def __init__(self, cnf):
+        self.cnf = cnf
+        self.variables = cnf.variables
+        # All ones for a negated literal, so XOR turns the variable word into the literal word.
+        self.negation_masks = np.where(cnf.negated, np.uint64(0xFFFFFFFFFFFFFFFF), np.uint64(0))[:, :, np.newaxis]
+        self.padding = cnf.padding if cnf.has_padding else None
+
+    def satisfied_counts(self, words, max_words=1 << 22):
+        """
+        Count the satisfied clauses of every packed assignment.
+
+        Parameters:
+        words (array): (n + 1) x W uint64 array of packed assignments.
+        max_words (int): Upper bound on the size of the intermediate literal array.
+
+        Returns:
+        array: Number of satisfied clauses for each of the 64 * W lanes.
+        """
+        words = np.asarray(words, dtype=np.uint64)
+        num_clauses, k = self.variables.shape
+        counts = np.zeros(words.shape[1] * LANES, dtype=np.int64)
+        rows = max(1, max_words // max(1, k * words.shape[1]))
+        for start in range(0, num_clauses, rows):
+            literal_words = words[self.variables[start:start + rows]] ^ self.negation_masks[start:start + rows]
+            if self.padding is not None:
+                literal_words[self.padding[start:start + rows]] = 0
+            counts += count_lanes(np.bitwise_or.reduce(literal_words, axis=1))
+        return counts
+
+def expand_flips(beam, start, stop):
+    """
+    Packed words for part of the single-flip neighbourhood of a beam.
+
+    Candidate c is beam member c // n with variable c % n + 1 flipped, the
+    order in which beam_search lists them. The words are built per beam
+    member and per word, never per candidate.
+
+    Parameters:
+    beam (array): B x (n + 1) boolean array of beam assignments.
+    start (int): First candidate.
+    stop (int): One past the last candidate.
+
+    Returns:
+    array: (n + 1) x ceil((stop - start) / 64) uint64 array with lane i holding candidate start + i.
+    """
+    n = beam.shape[1] - 1
+    candidates = np.arange(start, stop)
+    lanes = candidates - start
+    members = candidates // n
+    word_index = lanes // LANES
+
+    # A word covers lanes of a few consecutive beam members; mask out each one's lanes.
+    first_member = members[::LANES]
+    offsets = members - first_member[word_index]
+    words = np.zeros((n + 1, len(first_member)), dtype=np.uint64)
+    for offset in range(int(offsets.max()) + 1):
+        masks = pack_lanes(offsets == offset)
+        member = np.minimum(first_member + offset, len(beam) - 1)
+        words |= np.where(beam[member].T, masks, np.uint64(0))
+
+    flipped = candidates % n + 1
+    bits = np.left_shift(np.uint64(1), (lanes % LANES).astype(np.uint64))
+    np.bitwise_xor.at(words, (flipped, word_index), bits)
+    words[0] = 0
+    return words
+
+def bitsliced_beam_search(k_sat, beam_width=3, max_iterations=1000, max_words=1 << 22):
+    """
+    Beam Search for the k-SAT problem with bit-sliced candidate evaluation.
+
+    Makes the same random choices and returns the same result as beam_search,
+    but expands and scores the candidates 64 per machine word, which keeps
+    wide beams affordable.
+
+    Parameters:
+    k_sat (list): The k-SAT problem as a list of clauses.
+    beam_width (int): The width of the beam.
+    max_iterations (int): Maximum number of iterations to run.
+    max_words (int): Upper bound on the words built for one chunk of candidates.
+
+    Returns:
+    dict: A solution if found, else None.
+    """
+    n = max(abs(literal) for clause in k_sat for literal in clause)
+    cnf = CNF.from_clauses(k_sat, n)
+    sliced = BitSlicedCNF(cnf)
+    beam = cnf.assignment_array({var: random.choice([True, False]) for var in range(1, n + 1)})[np.newaxis, :]
+    chunk = max(LANES, max_words // (n + 1) // LANES * LANES)
+
+    for _ in range(max_iterations):
+        total = len(beam) * n
+        satisfied_counts = np.empty(total, dtype=np.int64)
+        for start in range(0, total, chunk):
+            stop = min(total, start + chunk)
+            words = expand_flips(beam, start, stop)
+            satisfied_counts[start:stop] = sliced.satisfied_counts(words, max_words)[:stop - start]
+
+        # A stable sort keeps the tie order of beam_search.
+        best = np.argsort(-satisfied_counts, kind='stable')[:beam_width]
+        beam = beam[best // n]
+        beam[np.arange(len(best)), best % n + 1] ^= True
+
+        if satisfied_counts[best[0]] == len(k_sat):
+            return cnf.assignment_dict(beam[0])
+
+    return None
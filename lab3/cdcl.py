@@ -0,0 +1,404 @@
+import heapq
+
+def _luby(index):
+    """
+    The index-th term (from 1) of the Luby restart sequence 1, 1, 2, 1, 1, 2, 4, ...
+
+    Parameters:
+    index (int): Position in the sequence.
+
+    Returns:
+    int: Sequence value.
+    """
+    size = 1
+    while size < index + 1:
+        size = 2 * size + 1
+    while size - 1 != index:
+        size //= 2
+        if index >= size:
+            index -= size
+    return (size + 1) // 2
+
+class CDCLSolver:
+    """
+    Complete conflict-driven clause-learning SAT solver.
+
+    Uses two watched literals for unit propagation, first-UIP clause learning
+    with clause minimization and non-chronological backjumping, VSIDS variable
+    activities with phase saving, and Luby restarts that also shrink the
+    learned-clause database. Literals are encoded internally as 2 * var for
+    var and 2 * var + 1 for -var.
+
+    Parameters:
+    k_sat (list): The k-SAT problem as a list of clauses.
+    n (int): Number of variables, the largest variable if None.
+    """
+
+    def __init__(self, k_sat, n=None):
+        if n is None:
+            n = max((abs(literal) for clause in k_sat for literal in clause), default=0)
+        self.n = n
+        self.values = [0] * (2 * n + 2)  # per literal: 1 true, -1 false, 0 unassigned
+        self.level = [0] * (n + 1)
+        self.reason = [None] * (n + 1)
+        self.trail = []
+        self.trail_limits = []
+        self.queue_head = 0
+        self.clauses = []
+        self.watches = [[] for _ in range(2 * n + 2)]
+        self.activity = [0.0] * (n + 1)
+        self.activity_increment = 1.0
+        self.activity_decay = 0.95
+        self.saved_phase = [False] * (n + 1)
+        self.heap = [(0.0, var) for var in range(1, n + 1)]
+        self.proof = []
+        self.conflicts = 0
+        self.decisions = 0
+        self.propagations = 0
+        self.inconsistent = False
+
+        for clause in k_sat:
+            literals = sorted({self._encode(literal) for literal in clause})
+            if any(literal ^ 1 in literals for literal in literals):
+                continue
+            self._add_clause(literals)
+        self.num_original = len(self.clauses)
+        self.max_learned = max(1000, self.num_original // 3)
+
+    @staticmethod
+    def _encode(literal):
+        return 2 * literal if literal > 0 else -2 * literal + 1
+
+    @staticmethod
+    def _decode(literal):
+        return literal >> 1 if literal & 1 == 0 else -(literal >> 1)
+
+    def _add_clause(self, literals):
+        if not literals:
+            self.inconsistent = True
+            return
+        if len(literals) == 1:
+            value = self.values[literals[0]]
+            if value == -1:
+                self.inconsistent = True
+            elif value == 0:
+                self._enqueue(literals[0], None)
+            return
+        index = len(self.clauses)
+        self.clauses.append(literals)
+        self.watches[literals[0]].append(index)
+        self.watches[literals[1]].append(index)
+
+    def _enqueue(self, literal, reason):
+        var = literal >> 1
+        self.values[literal] = 1
+        self.values[literal ^ 1] = -1
+        self.level[var] = len(self.trail_limits)
+        self.reason[var] = reason
+        self.trail.append(literal)
+
+    def _propagate(self):
+        """
+        Propagate the assignments on the trail.
+
+        Returns:
+        int: Index of a conflicting clause, or None.
+        """
+        values = self.values
+        clauses = self.clauses
+        watches = self.watches
+        while self.queue_head < len(self.trail):
+            false_literal = self.trail[self.queue_head] ^ 1
+            self.queue_head += 1
+            self.propagations += 1
+            watching = watches[false_literal]
+            kept = []
+            position = 0
+            while position < len(watching):
+                index = watching[position]
+                position += 1
+                clause = clauses[index]
+                if clause[0] == false_literal:
+                    clause[0], clause[1] = clause[1], clause[0]
+                first = clause[0]
+                if values[first] == 1:
+                    kept.append(index)
+                    continue
+                for other in range(2, len(clause)):
+                    if values[clause[other]] != -1:
+                        clause[1], clause[other] = clause[other], clause[1]
+                        watches[clause[1]].append(index)
+                        break
+                else:
+                    kept.append(index)
+                    if values[first] == -1:
+                        kept.extend(watching[position:])
+                        watches[false_literal] = kept
+                        return index
+                    self._enqueue(first, index)
+            watches[false_literal] = kept
+        return None
+
+    def _bump(self, var):
+        self.activity[var] += self.activity_increment
+        if self.activity[var] > 1e100:
+            self.activity = [value * 1e-100 for value in self.activity]
+            self.activity_increment *= 1e-100
+            self.heap = [(-self.activity[other], other) for other in range(1, self.n + 1)]
+            heapq.heapify(self.heap)
+        else:
+            heapq.heappush(self.heap, (-self.activity[var], var))
+
+    def _analyze(self, conflict):
+        """
+        Derive the first-UIP clause of a conflict.
+
+        Parameters:
+        conflict (int): Index of the conflicting clause.
+
+        Returns:
+        tuple: (learned clause with the asserting literal first, backjump level).
+        """
+        current_level = len(self.trail_limits)
+        seen = [False] * (self.n + 1)
+        learned = [None]
+        pending = 0
+        literal = None
+        position = len(self.trail) - 1
+        clause = self.clauses[conflict]
+
+        while True:
+            for other in clause:
+                if literal is not None and other == literal:
+                    continue
+                var = other >> 1
+                if not seen[var] and self.level[var] > 0:
+                    seen[var] = True
+                    self._bump(var)
+                    if self.level[var] == current_level:
+                        pending += 1
+                    else:
+                        learned.append(other)
+            while not seen[self.trail[position] >> 1]:
+                position -= 1
+            literal = self.trail[position]
+            position -= 1
+            seen[literal >> 1] = False
+            pending -= 1
+            if pending == 0:
+                break
+            clause = self.clauses[self.reason[literal >> 1]]
+
+        learned[0] = literal ^ 1
+        # Drop literals implied by other literals of the clause.
+        learned = [learned[0]] + [other for other in learned[1:] if not self._redundant(other, seen)]
+        if len(learned) == 1:
+            return learned, 0
+        # The literal from the highest remaining level becomes the second watch.
+        highest = max(range(1, len(learned)), key=lambda i: self.level[learned[i] >> 1])
+        learned[1], learned[highest] = learned[highest], learned[1]
+        return learned, self.level[learned[1] >> 1]
+
+    def _redundant(self, literal, seen):
+        reason = self.reason[literal >> 1]
+        if reason is None:
+            return False
+        for other in self.clauses[reason]:
+            var = other >> 1
+            if var != literal >> 1 and not seen[var] and self.level[var] > 0:
+                return False
+        return True
+
+    def _reduce(self):
+        """
+        At decision level 0, drop satisfied clauses and false literals, then
+        keep only the shorter half of the learned clauses.
+        """
+        for literal in self.trail:
+            self.reason[literal >> 1] = None
+        original = self._simplify(self.clauses[:self.num_original])
+        learned = sorted(self._simplify(self.clauses[self.num_original:]), key=len)
+        self.clauses = original + learned[:len(learned) // 2]
+        self.num_original = len(original)
+        self.watches = [[] for _ in range(2 * self.n + 2)]
+        for index, clause in enumerate(self.clauses):
+            self.watches[clause[0]].append(index)
+            self.watches[clause[1]].append(index)
+
+    def _simplify(self, clauses):
+        # Level 0 is fully propagated here, so every clause that is not yet
+        # satisfied still has at least two unassigned literals.
+        values = self.values
+        return [[literal for literal in clause if values[literal] == 0] for clause in clauses
+                if not any(values[literal] == 1 for literal in clause)]
+
+    def _backjump(self, level):
+        if len(self.trail_limits) <= level:
+            return
+        limit = self.trail_limits[level]
+        for literal in self.trail[limit:]:
+            var = literal >> 1
+            self.saved_phase[var] = literal & 1 == 0
+            self.values[literal] = 0
+            self.values[literal ^ 1] = 0
+            self.reason[var] = None
+            heapq.heappush(self.heap, (-self.activity[var], var))
+        del self.trail[limit:]
+        del self.trail_limits[level:]
+        self.queue_head = limit
+
+    def _decide(self):
+        while self.heap:
+            negative_activity, var = heapq.heappop(self.heap)
+            if self.values[2 * var] == 0 and -negative_activity == self.activity[var]:
+                self.decisions += 1
+                self.trail_limits.append(len(self.trail))
+                self._enqueue(2 * var if self.saved_phase[var] else 2 * var + 1, None)
+                return True
+        for var in range(1, self.n + 1):
+            if self.values[2 * var] == 0:
+                self.decisions += 1
+                self.trail_limits.append(len(self.trail))
+                self._enqueue(2 * var if self.saved_phase[var] else 2 * var + 1, None)
+                return True
+        return False
+
+    def solve(self, max_conflicts=None, restart_base=100):
+        """
+        Decide the problem.
+
+        Parameters:
+        max_conflicts (int): Give up after this many conflicts, never if None.
+        restart_base (int): Conflicts per unit of the Luby restart sequence.
+
+        Returns:
+        tuple: ('SAT', solution dict), ('UNSAT', DRUP proof) or ('UNKNOWN', None).
+        """
+        if self.inconsistent or self._propagate() is not None:
+            self.proof.append([])
+            return 'UNSAT', self.proof
+
+        restarts = 0
+        conflicts_until_restart = restart_base * _luby(restarts)
+        while True:
+            conflict = self._propagate()
+            if conflict is not None:
+                self.conflicts += 1
+                if not self.trail_limits:
+                    self.proof.append([])
+                    return 'UNSAT', self.proof
+                learned, level = self._analyze(conflict)
+                self.proof.append([self._decode(literal) for literal in learned])
+                self._backjump(level)
+                if len(learned) == 1:
+                    self._enqueue(learned[0], None)
+                else:
+                    index = len(self.clauses)
+                    self.clauses.append(learned)
+                    self.watches[learned[0]].append(index)
+                    self.watches[learned[1]].append(index)
+                    self._enqueue(learned[0], index)
+                self.activity_increment /= self.activity_decay
+                conflicts_until_restart -= 1
+                if max_conflicts is not None and self.conflicts >= max_conflicts:
+                    return 'UNKNOWN', None
+            elif conflicts_until_restart <= 0:
+                restarts += 1
+                conflicts_until_restart = restart_base * _luby(restarts)
+                self._backjump(0)
+                if len(self.clauses) - self.num_original > self.max_learned:
+                    self._reduce()
+                    self.max_learned = int(self.max_learned * 1.1)
+            elif not self._decide():
+                return 'SAT', {var: self.values[2 * var] == 1 for var in range(1, self.n + 1)}
+
+def cdcl(k_sat, max_conflicts=None):
+    """
+    Complete CDCL solver for the k-SAT problem.
+
+    Parameters:
+    k_sat (list): The k-SAT problem as a list of clauses.
+    max_conflicts (int): Give up after this many conflicts, never if None.
+
+    Returns:
+    tuple: ('SAT', solution dict), ('UNSAT', DRUP proof as a list of clauses ending with []),
+    or ('UNKNOWN', None) if the conflict budget ran out.
+    """
+    return CDCLSolver(k_sat).solve(max_conflicts)
+
+def check_drup_proof(k_sat, proof):
+    """
+    Check that every lemma of a DRUP proof follows by unit propagation and that it ends with the empty clause.
+
+    Parameters:
+    k_sat (list): The k-SAT problem as a list of clauses.
+    proof (list): Learned clauses in the order they were derived.
+
+    Returns:
+    bool: True if the proof refutes the problem.
+    """
+    clauses = [set(clause) for clause in k_sat]
+    for lemma in proof:
+        assignment = {-literal for literal in lemma}
+        if not _propagates_to_conflict(clauses, assignment):
+            return False
+        clauses.append(set(lemma))
+    return bool(proof) and proof[-1] == []
+
+def _propagates_to_conflict(clauses, assignment):
+    """
+    Unit-propagate a set of true literals over the clauses.
+
+    Parameters:
+    clauses (list): Clauses as sets of literals.
+    assignment (set): Literals assumed true.
+
+    Returns:
+    bool: True if propagation falsifies a clause.
+    """
+    assignment = set(assignment)
+    if any(-literal in assignment for literal in assignment):
+        return True
+    changed = True
+    while changed:
+        changed = False
+        for clause in clauses:
+            if any(literal in assignment for literal in clause):
+                continue
+            unassigned = [literal for literal in clause if -literal not in assignment]
+            if not unassigned:
+                return True
+            if len(unassigned) == 1:
+                assignment.add(unassigned[0])
+                changed = True
+    return False
+
+if __name__ == "__main__":
+    import random
+    import time
+
+    from lab3_a import generate_k_sat, heuristic_satisfied_clauses
+    from walksat import walksat
+
+    # Cross-check the complete solver against local search around the phase transition.
+    for n, ratio in [(20, 4.26), (50, 4.26), (50, 5.0), (200, 4.0), (200, 4.26), (1000, 3.0)]:
+        m = int(ratio * n)
+        for seed in range(3):
+            random.seed(seed)
+            k_sat_problem = generate_k_sat(3, m, n)
+            start_time = time.time()
+            status, result = cdcl(k_sat_problem)
+            cdcl_time = time.time() - start_time
+            local_solution = walksat(k_sat_problem, max_flips=100000, max_tries=3, seed=seed)
+
+            if status == 'SAT':
+                assert heuristic_satisfied_clauses(result, k_sat_problem) == m
+                detail = "model verified"
+            else:
+                assert local_solution is None, "local search satisfied an instance CDCL refuted"
+                detail = f"{len(result)} proof lemmas"
+                if n <= 50:
+                    assert check_drup_proof(k_sat_problem, result)
+                    detail += ", proof checked"
+            local = "solved" if local_solution is not None else "gave up"
+            print(f"n={n} m={m} seed={seed}: CDCL {status} in {cdcl_time:.3f} s ({detail}); local search {local}")
@@ -0,0 +1,136 @@
+import numpy as np
+
+class CNF:
+    """
+    k-SAT problem stored as an m x k int32 matrix of literals.
+
+    Variables are numbered 1..n and a literal -v is the negation of v. Shorter
+    clauses are padded with 0, which never evaluates to true. Assignments are
+    boolean arrays of length n + 1 indexed by variable; column 0 is unused.
+
+    Parameters:
+    literals (array): m x k matrix of literals.
+    n (int): Number of variables.
+    """
+
+    def __init__(self, literals, n):
+        self.literals = np.asarray(literals, dtype=np.int32)
+        if self.literals.ndim != 2:
+            raise ValueError("literals must be an m x k matrix")
+        self.n = int(n)
+        self.num_clauses = self.literals.shape[0]
+        self.variables = np.abs(self.literals)
+        self.negated = self.literals < 0
+        self.padding = self.literals == 0
+        self.has_padding = bool(self.padding.any())
+
+    @classmethod
+    def from_clauses(cls, k_sat, n=None):
+        """
+        Build a CNF from the list-of-sets format used by the solvers.
+
+        Parameters:
+        k_sat (list): The k-SAT problem as a list of clauses.
+        n (int): Number of variables, the largest variable if None.
+
+        Returns:
+        CNF: The same problem as a literal matrix.
+        """
+        if n is None:
+            n = max((abs(literal) for clause in k_sat for literal in clause), default=0)
+        width = max((len(clause) for clause in k_sat), default=0)
+        literals = np.zeros((len(k_sat), width), dtype=np.int32)
+        for index, clause in enumerate(k_sat):
+            literals[index, :len(clause)] = sorted(clause, key=abs)
+        return cls(literals, n)
+
+    def to_clauses(self):
+        """
+        Convert back to the list-of-sets format used by the solvers.
+
+        Returns:
+        list: A list of clauses representing the k-SAT problem.
+        """
+        return [set(int(literal) for literal in row if literal != 0) for row in self.literals]
+
+    def assignment_array(self, solution):
+        """
+        Convert a dict assignment to a boolean array.
+
+        Parameters:
+        solution (dict): Variable assignments keyed 1..n.
+
+        Returns:
+        array: Boolean array of length n + 1.
+        """
+        values = np.zeros(self.n + 1, dtype=bool)
+        for var, value in solution.items():
+            values[var] = value
+        return values
+
+    def assignment_dict(self, values):
+        """
+        Convert a boolean assignment array to the dict format used by the solvers.
+
+        Parameters:
+        values (array): Boolean array of length n + 1.
+
+        Returns:
+        dict: Variable assignments keyed 1..n.
+        """
+        return {var: bool(values[var]) for var in range(1, self.n + 1)}
+
+    def satisfied_counts(self, assignments, max_elements=1 << 24):
+        """
+        Count the satisfied clauses of a batch of assignments at once.
+
+        Parameters:
+        assignments (array): B x (n + 1) boolean array, one assignment per row.
+        max_elements (int): Upper bound on the size of the intermediate literal array.
+
+        Returns:
+        array: Number of satisfied clauses for every assignment.
+        """
+        assignments = np.asarray(assignments, dtype=bool)
+        if assignments.ndim == 1:
+            return self.satisfied_counts(assignments[np.newaxis, :], max_elements)[0]
+
+        counts = np.empty(len(assignments), dtype=np.int64)
+        rows = max(1, max_elements // max(1, self.literals.size))
+        for start in range(0, len(assignments), rows):
+            batch = assignments[start:start + rows]
+            literal_values = batch[:, self.variables] != self.negated
+            if self.has_padding:
+                literal_values &= ~self.padding
+            counts[start:start + rows] = literal_values.any(axis=2).sum(axis=1)
+        return counts
+
+def generate_cnf(k, m, n, seed=None):
+    """
+    Generate a random k-SAT problem with NumPy, clause by clause like generate_k_sat.
+
+    Every clause has k distinct variables, each negated with probability 1/2.
+    The same seed always gives the same problem.
+
+    Parameters:
+    k (int): Number of literals per clause.
+    m (int): Number of clauses.
+    n (int): Number of variables.
+    seed (int or list): Seed for numpy.random.default_rng, fresh entropy if None.
+
+    Returns:
+    CNF: The problem as an m x k literal matrix.
+    """
+    if k > n:
+        raise ValueError("k must not exceed the number of variables")
+    rng = np.random.default_rng(seed)
+    variables = rng.integers(1, n + 1, size=(m, k), dtype=np.int32)
+    # Redraw the few rows that repeat a variable until none are left.
+    while True:
+        ordered = np.sort(variables, axis=1)
+        repeated = np.flatnonzero((ordered[:, 1:] == ordered[:, :-1]).any(axis=1))
+        if not len(repeated):
+            break
+        variables[repeated] = rng.integers(1, n + 1, size=(len(repeated), k), dtype=np.int32)
+    signs = np.where(rng.random((m, k)) < 0.5, -1, 1).astype(np.int32)
+    return CNF(variables * signs, n)
@@ -0,0 +1,123 @@
+import numpy as np
+
+from cnf import CNF
+
+def iter_dimacs(file_path):
+    """
+    Stream the clauses of a DIMACS CNF file one at a time.
+
+    Comment lines and the problem line are skipped, clauses may span several
+    lines, and the '%' end marker used by the SATLIB benchmarks stops reading.
+
+    Parameters:
+    file_path (str): Path of the .cnf file.
+
+    Yields:
+    list: The literals of one clause.
+    """
+    clause = []
+    with open(file_path, 'rb') as file:
+        for line in file:
+            first = line[:1]
+            if first in (b'c', b'p', b'\n', b'\r', b''):
+                continue
+            if first == b'%':
+                break
+            for token in line.split():
+                literal = int(token)
+                if literal == 0:
+                    yield clause
+                    clause = []
+                else:
+                    clause.append(literal)
+    if clause:
+        yield clause
+
+def read_header(file_path):
+    """
+    Read the problem line of a DIMACS CNF file.
+
+    Parameters:
+    file_path (str): Path of the .cnf file.
+
+    Returns:
+    tuple: (number of variables, number of clauses), or None if there is no problem line.
+    """
+    with open(file_path, 'rb') as file:
+        for line in file:
+            if line.startswith(b'p'):
+                _, _, n, m = line.split()[:4]
+                return int(n), int(m)
+            if not line.startswith(b'c') and line.strip():
+                break
+    return None
+
+def read_dimacs(file_path):
+    """
+    Read a DIMACS CNF file in the list-of-sets format used by the solvers.
+
+    Parameters:
+    file_path (str): Path of the .cnf file.
+
+    Returns:
+    list: A list of clauses representing the k-SAT problem.
+    """
+    return [set(clause) for clause in iter_dimacs(file_path)]
+
+def read_dimacs_cnf(file_path):
+    """
+    Read a DIMACS CNF file straight into a literal matrix.
+
+    The literals are streamed into one flat int32 array and split at the
+    terminating zeros, so no per-clause Python objects are kept.
+
+    Parameters:
+    file_path (str): Path of the .cnf file.
+
+    Returns:
+    CNF: The problem as a literal matrix padded with 0.
+    """
+    header = read_header(file_path)
+    tokens = np.fromiter((literal for clause in iter_dimacs(file_path) for literal in (*clause, 0)),
+                         dtype=np.int32)
+    ends = np.flatnonzero(tokens == 0)
+    starts = np.concatenate(([0], ends[:-1] + 1))
+    lengths = ends - starts
+    width = int(lengths.max()) if len(lengths) else 0
+    literals = np.zeros((len(lengths), width), dtype=np.int32)
+    if len(lengths) and (lengths == width).all():
+        literals[:] = np.delete(tokens, ends).reshape(-1, width)
+    else:
+        columns = np.arange(len(tokens)) - np.repeat(starts, lengths + 1)
+        body = tokens != 0
+        literals[np.repeat(np.arange(len(lengths)), lengths + 1)[body], columns[body]] = tokens[body]
+    n = header[0] if header else int(np.abs(tokens).max(initial=0))
+    return CNF(literals, n)
+
+def write_dimacs(file_path, k_sat, n=None, comments=(), chunk_size=1 << 16):
+    """
+    Write a problem as a DIMACS CNF file.
+
+    Parameters:
+    file_path (str): Path of the .cnf file.
+    k_sat (list or CNF): The problem as a list of clauses or a literal matrix.
+    n (int): Number of variables, taken from the problem if None.
+    comments (iterable): Lines written as 'c' comments before the problem line.
+    chunk_size (int): Clauses formatted per write for a CNF matrix.
+    """
+    with open(file_path, 'w') as file:
+        for comment in comments:
+            file.write(f"c {comment}\n")
+        if isinstance(k_sat, CNF):
+            file.write(f"p cnf {k_sat.n if n is None else n} {k_sat.num_clauses}\n")
+            for start in range(0, k_sat.num_clauses, chunk_size):
+                for row in k_sat.literals[start:start + chunk_size].tolist():
+                    file.write(' '.join([str(literal) for literal in row if literal != 0]))
+                    file.write(' 0\n')
+        else:
+            if n is None:
+                n = max((abs(literal) for clause in k_sat for literal in clause), default=0)
+            file.write(f"p cnf {n} {len(k_sat)}\n")
+            for clause in k_sat:
+                file.write(' '.join([str(literal) for literal in clause]))
+                file.write(' 0\n')
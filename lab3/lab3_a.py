@@ -1,6 +1,11 @@
 import random
 import time
 
+import numpy as np
+
+from cnf import CNF
+from sat_state import SATState
+
 def generate_k_sat(k, m, n):
     """
     Generate a random k-SAT problem.
@@ -24,32 +29,35 @@ def generate_k_sat(k, m, n):
         clauses.append(clause)
     return clauses
 
-def hill_climbing(k_sat, max_iterations=1000):
+def hill_climbing(k_sat, max_iterations=1000, should_stop=None):
     """
     Hill-Climbing algorithm to solve the k-SAT problem.
     
     Parameters:
     k_sat (list): The k-SAT problem as a list of clauses.
     max_iterations (int): Maximum number of iterations to run.
+    should_stop (callable): Polled periodically; the search gives up when it returns True.
     
     Returns:
     dict: A solution if found, else None.
     """
     n = max(abs(literal) for clause in k_sat for literal in clause)  
     solution = {var: random.choice([True, False]) for var in range(1, n + 1)}
-
-    for _ in range(max_iterations):
-        satisfied_clauses = [clause for clause in k_sat if any((literal > 0) == solution[abs(literal)] for literal in clause)]
-        
-        if len(satisfied_clauses) == len(k_sat):
-            return solution  
+    state = SATState(k_sat, solution)
+    variables = list(solution.keys())
+
+    for iteration in range(max_iterations):
+        if state.num_unsat == 0:
+            return state.assignment()  
+        if should_stop is not None and iteration & 1023 == 0 and iteration and should_stop():
+            return None
         
-        var_to_flip = random.choice(list(solution.keys()))
-        solution[var_to_flip] = not solution[var_to_flip]
+        var_to_flip = random.choice(variables)
+        state.flip(var_to_flip)
 
     return None  
 
-def beam_search(k_sat, beam_width=3, max_iterations=1000):
+def beam_search(k_sat, beam_width=3, max_iterations=1000, should_stop=None):
     """
     Beam Search algorithm to solve the k-SAT problem.
     
@@ -57,64 +65,63 @@ def beam_search(k_sat, beam_width=3, max_iterations=1000):
     k_sat (list): The k-SAT problem as a list of clauses.
     beam_width (int): The width of the beam.
     max_iterations (int): Maximum number of iterations to run.
+    should_stop (callable): Polled periodically; the search gives up when it returns True.
     
     Returns:
     dict: A solution if found, else None.
     """
     n = max(abs(literal) for clause in k_sat for literal in clause)
-    current_solutions = [{var: random.choice([True, False]) for var in range(1, n + 1)}]
+    cnf = CNF.from_clauses(k_sat, n)
+    current_solutions = cnf.assignment_array({var: random.choice([True, False]) for var in range(1, n + 1)})[np.newaxis, :]
+    flipped_variables = np.arange(1, n + 1)
 
     for _ in range(max_iterations):
-        next_solutions = []
-        
-        for solution in current_solutions:
-            for var in solution.keys():
-               
-                new_solution = solution.copy()
-                new_solution[var] = not new_solution[var]
-                next_solutions.append(new_solution)
+        if should_stop is not None and should_stop():
+            return None
 
-        
-        next_solutions = sorted(next_solutions, key=lambda sol: sum(1 for clause in k_sat if any((literal > 0) == sol[abs(literal)] for literal in clause)), reverse=True)
+        # Every solution in the beam with each variable flipped in turn.
+        next_solutions = np.repeat(current_solutions, n, axis=0)
+        rows = np.arange(len(next_solutions))
+        next_solutions[rows, np.tile(flipped_variables, len(current_solutions))] ^= True
 
-        
-        current_solutions = next_solutions[:beam_width]
+        # Scored in one batch; a stable sort keeps the original tie order.
+        satisfied_counts = cnf.satisfied_counts(next_solutions)
+        best = np.argsort(-satisfied_counts, kind='stable')[:beam_width]
+
+        current_solutions = next_solutions[best]
 
-        if any(len([clause for clause in k_sat if any((literal > 0) == sol[abs(literal)] for literal in clause)]) == len(k_sat) for sol in current_solutions):
-            return current_solutions[0]  
+        if satisfied_counts[best[0]] == len(k_sat):
+            return cnf.assignment_dict(current_solutions[0])  
 
     return None  
 
-def variable_neighborhood_descent(k_sat, max_iterations=1000):
+def variable_neighborhood_descent(k_sat, max_iterations=1000, should_stop=None):
     """
     Variable Neighborhood Descent algorithm to solve the k-SAT problem.
     
     Parameters:
     k_sat (list): The k-SAT problem as a list of clauses.
     max_iterations (int): Maximum number of iterations to run.
+    should_stop (callable): Polled periodically; the search gives up when it returns True.
     
     Returns:
     dict: A solution if found, else None.
     """
     n = max(abs(literal) for clause in k_sat for literal in clause)
     solution = {var: random.choice([True, False]) for var in range(1, n + 1)}
+    state = SATState(k_sat, solution)
 
     for _ in range(max_iterations):
-       
-        satisfied_count = sum(1 for clause in k_sat if any((literal > 0) == solution[abs(literal)] for literal in clause))
+        if should_stop is not None and should_stop():
+            return None
         
-        
-        for var in solution.keys():
-            new_solution = solution.copy()
-            new_solution[var] = not new_solution[var]
-            new_satisfied_count = sum(1 for clause in k_sat if any((literal > 0) == new_solution[abs(literal)] for literal in clause))
-            
-            if new_satisfied_count > satisfied_count:
-                solution = new_solution
-                satisfied_count = new_satisfied_count
-
-        if satisfied_count == len(k_sat):
-            return solution  
+        # Accept every flip that satisfies more clauses than it breaks.
+        for var in range(1, n + 1):
+            if state.score(var) > 0:
+                state.flip(var)
+
+        if state.num_unsat == 0:
+            return state.assignment()  
 
     return None  
 
@@ -0,0 +1,153 @@
+import multiprocessing
+import os
+import random
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from lab3_a import beam_search, heuristic_satisfied_clauses, hill_climbing, variable_neighborhood_descent
+from walksat import walksat
+
+_instance = None
+_stop_event = None
+
+def _init_worker(k_sat, stop_event):
+    """
+    Receive the problem and the shared stop flag once per worker process.
+
+    Parameters:
+    k_sat (list): The k-SAT problem as a list of clauses.
+    stop_event (Event): Set by the runner as soon as any worker succeeds.
+    """
+    global _instance, _stop_event
+    _instance = k_sat
+    _stop_event = stop_event
+
+def run_configuration(configuration, k_sat=None, stop_event=None):
+    """
+    Run one solver configuration.
+
+    Parameters:
+    configuration (dict): 'solver', optional 'seed' and solver keyword arguments.
+    k_sat (list): The problem, the one shared with the worker if None.
+    stop_event (Event): Stop flag, the one shared with the worker if None.
+
+    Returns:
+    tuple: (configuration, solution or None, stats dict).
+    """
+    k_sat = _instance if k_sat is None else k_sat
+    stop_event = _stop_event if stop_event is None else stop_event
+    parameters = {key: value for key, value in configuration.items() if key not in ('solver', 'seed')}
+    solver = configuration['solver']
+    seed = configuration.get('seed')
+    stats = {'pid': os.getpid()}
+    if stop_event is not None and stop_event.is_set():
+        # Picked up after another configuration already succeeded.
+        stats['skipped'] = True
+        return configuration, None, stats
+    start_time = time.perf_counter()
+
+    should_stop = stop_event.is_set if stop_event is not None else None
+    if solver in ('walksat', 'probsat'):
+        solution = walksat(k_sat, method=solver, seed=seed, stats=stats, should_stop=should_stop, **parameters)
+    else:
+        # The classic solvers use the global generator and poll the same stop flag.
+        random.seed(seed)
+        solvers = {
+            'hill_climbing': hill_climbing,
+            'beam_search': beam_search,
+            'variable_neighborhood_descent': variable_neighborhood_descent,
+        }
+        solution = solvers[solver](k_sat, should_stop=should_stop, **parameters)
+        stats['seconds'] = time.perf_counter() - start_time
+
+    return configuration, solution, stats
+
+def default_configurations(seeds=8):
+    """
+    A mix of probSAT and WalkSAT settings, each with several seeds.
+
+    Parameters:
+    seeds (int): Number of seeds per setting.
+
+    Returns:
+    list: Solver configurations.
+    """
+    settings = [
+        {'solver': 'probsat', 'cb': 2.06},
+        {'solver': 'probsat', 'cb': 2.5},
+        {'solver': 'walksat', 'noise': 0.5},
+        {'solver': 'walksat', 'noise': 0.567},
+    ]
+    return [dict(setting, seed=seed) for seed in range(seeds) for setting in settings]
+
+def run_portfolio(k_sat, configurations=None, workers=None, time_limit=None):
+    """
+    Run many solver configurations in parallel and return the first satisfying assignment.
+
+    Parameters:
+    k_sat (list): The k-SAT problem as a list of clauses.
+    configurations (list): Solver configurations, default_configurations() if None.
+    workers (int): Number of worker processes, one per CPU if None.
+    time_limit (float): Wall-clock budget in seconds passed to the random-walk solvers.
+
+    Returns:
+    tuple: (solution or None, report dict with the winning configuration and per-run stats).
+    """
+    configurations = default_configurations() if configurations is None else configurations
+    if time_limit is not None:
+        configurations = [dict(configuration, time_limit=time_limit)
+                          if configuration['solver'] in ('walksat', 'probsat') else configuration
+                          for configuration in configurations]
+    workers = workers or os.cpu_count()
+    stop_event = multiprocessing.Event()
+    start_time = time.perf_counter()
+    solution = None
+    winner = None
+    runs = []
+
+    executor = ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(k_sat, stop_event))
+    try:
+        pending = {executor.submit(run_configuration, configuration) for configuration in configurations}
+        while pending and solution is None:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                configuration, candidate, stats = future.result()
+                runs.append({'configuration': configuration, 'solved': candidate is not None, **stats})
+                if candidate is not None and solution is None and \
+                        heuristic_satisfied_clauses(candidate, k_sat) == len(k_sat):
+                    solution, winner = candidate, configuration
+        if solution is not None:
+            # Queued configurations are dropped and running solvers see the flag.
+            stop_event.set()
+            for future in pending:
+                future.cancel()
+            for future in pending:
+                if not future.cancelled():
+                    configuration, _, stats = future.result()
+                    runs.append({'configuration': configuration, 'solved': False, 'cancelled': True, **stats})
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+    report = {
+        'winner': winner,
+        'seconds': time.perf_counter() - start_time,
+        'runs': runs,
+        'cancelled': len(configurations) - len(runs),
+    }
+    return solution, report
+
+if __name__ == "__main__":
+    from lab3_a import generate_k_sat
+
+    n = 1000
+    m = int(4.2 * n)
+    k_sat_problem = generate_k_sat(3, m, n)
+    solution, report = run_portfolio(k_sat_problem, time_limit=120)
+
+    print(f"n={n} m={m}: solved={solution is not None} in {report['seconds']:.2f} s")
+    print("Winning configuration:", report['winner'])
+    print(f"Runs finished: {len(report['runs'])}, cancelled before starting: {report['cancelled']}")
+    for run in report['runs']:
+        rate = run.get('flips_per_second')
+        rate_text = f"{rate:,.0f} flips/s" if rate is not None else "n/a"
+        print(f"  pid {run['pid']}: {run['configuration']} solved={run['solved']} {rate_text}")
@@ -0,0 +1,202 @@
+class SATState:
+    """
+    Incremental local-search state for a k-SAT problem.
+
+    For the current assignment it keeps the number of true literals in every
+    clause and the make/break counts of every variable, so flipping a variable
+    only touches the clauses it occurs in.
+
+    Parameters:
+    k_sat (list): The k-SAT problem as a list of clauses.
+    assignment (dict): Initial variable assignments, keyed 1..n.
+    track_scores (bool): Keep variables bucketed by score for best_flip().
+    """
+
+    def __init__(self, k_sat, assignment, track_scores=True):
+        self.n = max(assignment)
+        self.values = [False] * (self.n + 1)
+        for var, value in assignment.items():
+            self.values[var] = value
+
+        # Clauses holding both x and -x are always satisfied and never change.
+        self.clauses = []
+        self.num_tautologies = 0
+        for clause in k_sat:
+            if any(-literal in clause for literal in clause):
+                self.num_tautologies += 1
+            else:
+                self.clauses.append(tuple(clause))
+        self.num_clauses = len(self.clauses) + self.num_tautologies
+
+        self.occurrences = [[] for _ in range(self.n + 1)]
+        for index, clause in enumerate(self.clauses):
+            for literal in clause:
+                self.occurrences[abs(literal)].append((index, literal > 0))
+
+        self.true_count = [0] * len(self.clauses)
+        # XOR of the variables of the true literals: with one true literal it
+        # is exactly the critical variable.
+        self.true_xor = [0] * len(self.clauses)
+        self.make = [0] * (self.n + 1)
+        self.breaks = [0] * (self.n + 1)
+        self.num_unsat = 0
+        # Unsatisfied clauses in a list plus each clause's position in it, so
+        # adding, removing and sampling are all O(1).
+        self.unsat_clauses = []
+        self.unsat_position = [-1] * len(self.clauses)
+
+        values = self.values
+        for index, clause in enumerate(self.clauses):
+            count = 0
+            xor = 0
+            for literal in clause:
+                if (literal > 0) == values[abs(literal)]:
+                    count += 1
+                    xor ^= abs(literal)
+            self.true_count[index] = count
+            self.true_xor[index] = xor
+            if count == 0:
+                self.num_unsat += 1
+                self._add_unsat(index)
+                for literal in clause:
+                    self.make[abs(literal)] += 1
+            elif count == 1:
+                self.breaks[xor] += 1
+
+        self.scores = None
+        self.buckets = None
+        if track_scores:
+            self._build_buckets()
+
+    def _build_buckets(self):
+        # Variables bucketed by score, so the best flip is found without a scan.
+        self.scores = [self.make[var] - self.breaks[var] for var in range(self.n + 1)]
+        self.buckets = {}
+        for var in range(1, self.n + 1):
+            self.buckets.setdefault(self.scores[var], set()).add(var)
+        self.max_score = max(self.buckets, default=0)
+
+    def _add_unsat(self, index):
+        self.unsat_position[index] = len(self.unsat_clauses)
+        self.unsat_clauses.append(index)
+
+    def num_satisfied(self):
+        """
+        Count the satisfied clauses.
+
+        Returns:
+        int: Number of satisfied clauses.
+        """
+        return self.num_clauses - self.num_unsat
+
+    def score(self, var):
+        """
+        Change in satisfied clauses if a variable were flipped.
+
+        Parameters:
+        var (int): The variable to evaluate.
+
+        Returns:
+        int: make - break for the variable.
+        """
+        return self.make[var] - self.breaks[var]
+
+    def flip(self, var):
+        """
+        Flip a variable and update the clause and make/break counts it affects.
+
+        Parameters:
+        var (int): The variable to flip.
+        """
+        true_count = self.true_count
+        true_xor = self.true_xor
+        make = self.make
+        breaks = self.breaks
+        clauses = self.clauses
+        unsat_clauses = self.unsat_clauses
+        unsat_position = self.unsat_position
+        value = self.values[var]
+        track = self.buckets is not None
+        touched = [var]
+
+        for index, positive in self.occurrences[var]:
+            if positive == value:
+                # The literal goes from true to false.
+                count = true_count[index] - 1
+                true_count[index] = count
+                true_xor[index] ^= var
+                if count == 0:
+                    self.num_unsat += 1
+                    unsat_position[index] = len(unsat_clauses)
+                    unsat_clauses.append(index)
+                    breaks[var] -= 1
+                    for literal in clauses[index]:
+                        make[abs(literal)] += 1
+                    if track:
+                        touched.extend(abs(literal) for literal in clauses[index])
+                elif count == 1:
+                    breaks[true_xor[index]] += 1
+                    if track:
+                        touched.append(true_xor[index])
+            else:
+                # The literal goes from false to true.
+                count = true_count[index] + 1
+                true_count[index] = count
+                if count == 1:
+                    self.num_unsat -= 1
+                    position = unsat_position[index]
+                    last = unsat_clauses.pop()
+                    if last != index:
+                        unsat_clauses[position] = last
+                        unsat_position[last] = position
+                    unsat_position[index] = -1
+                    for literal in clauses[index]:
+                        make[abs(literal)] -= 1
+                    if track:
+                        touched.extend(abs(literal) for literal in clauses[index])
+                    breaks[var] += 1
+                elif count == 2:
+                    breaks[true_xor[index]] -= 1
+                    if track:
+                        touched.append(true_xor[index])
+                true_xor[index] ^= var
+
+        self.values[var] = not value
+        if not track:
+            return
+
+        scores = self.scores
+        buckets = self.buckets
+        for other in touched:
+            new_score = make[other] - breaks[other]
+            old_score = scores[other]
+            if new_score != old_score:
+                buckets[old_score].discard(other)
+                buckets.setdefault(new_score, set()).add(other)
+                scores[other] = new_score
+                if new_score > self.max_score:
+                    self.max_score = new_score
+
+    def best_flip(self):
+        """
+        Find a variable whose flip satisfies the most additional clauses.
+
+        Returns:
+        tuple: (variable, score) of the best flip.
+        """
+        if self.buckets is None:
+            self._build_buckets()
+        # Scores only move by small steps, so walking down from the last
+        # maximum to the first non-empty bucket is close to constant time.
+        while not self.buckets.get(self.max_score):
+            self.max_score -= 1
+        return next(iter(self.buckets[self.max_score])), self.max_score
+
+    def assignment(self):
+        """
+        Current assignment in the dict format used by the solvers.
+
+        Returns:
+        dict: Variable assignments keyed 1..n.
+        """
+        return {var: self.values[var] for var in range(1, self.n + 1)}
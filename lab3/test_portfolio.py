@@ -0,0 +1,30 @@
+import pytest
+
+from lab3_a import beam_search, generate_k_sat, hill_climbing, variable_neighborhood_descent
+from portfolio import run_portfolio
+
+UNSATISFIABLE = [[1, 2], [1, -2], [-1, 2], [-1, -2]]
+
+@pytest.mark.parametrize('solver', [hill_climbing, beam_search, variable_neighborhood_descent])
+def test_classic_solvers_give_up_when_asked(solver):
+    calls = []
+
+    def should_stop():
+        calls.append(1)
+        return True
+
+    # Without the hook these would run for 10**9 iterations.
+    assert solver(UNSATISFIABLE, max_iterations=10 ** 9, should_stop=should_stop) is None
+    assert calls
+
+def test_portfolio_stops_classic_solvers_after_a_win():
+    k_sat = generate_k_sat(3, 200, 100)
+    configurations = [
+        {'solver': 'beam_search', 'max_iterations': 10 ** 9, 'seed': 0},
+        {'solver': 'hill_climbing', 'max_iterations': 10 ** 9, 'seed': 0},
+        {'solver': 'probsat', 'seed': 0},
+    ]
+    solution, report = run_portfolio(k_sat, configurations, workers=3, time_limit=60)
+    assert solution is not None
+    assert report['winner']['solver'] == 'probsat'
+    assert report['seconds'] < 30
@@ -0,0 +1,9 @@
+import pytest
+
+from walksat import walksat
+
+@pytest.mark.parametrize('method', ['walksat', 'probsat'])
+def test_solution_found_by_the_last_flip_is_returned(method):
+    # With one try of one flip, a start with x1 false is solved only by the final flip.
+    for seed in range(20):
+        assert walksat([[1]], method=method, max_flips=1, max_tries=1, seed=seed) == {1: True}
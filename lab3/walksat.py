@@ -0,0 +1,122 @@
+import random
+import time
+
+from sat_state import SATState
+
+def walksat(k_sat, method='probsat', noise=0.567, cb=2.06, eps=0.9, max_flips=1000000, max_tries=10,
+            time_limit=None, seed=None, stats=None, should_stop=None):
+    """
+    Focused random-walk local search (WalkSAT or probSAT) for the k-SAT problem.
+
+    Every step picks a random unsatisfied clause and flips one of its
+    variables. WalkSAT flips a variable that breaks no clause if there is one,
+    otherwise a random variable with probability `noise` and a least-breaking
+    one otherwise. probSAT flips a variable with probability proportional to
+    (eps + break) ** -cb.
+
+    Parameters:
+    k_sat (list): The k-SAT problem as a list of clauses.
+    method (str): 'walksat' or 'probsat'.
+    noise (float): WalkSAT random-walk probability.
+    cb (float): probSAT break exponent.
+    eps (float): probSAT break offset.
+    max_flips (int): Flips per try before restarting from a new random assignment.
+    max_tries (int): Number of tries, unlimited if None.
+    time_limit (float): Wall-clock budget in seconds, unlimited if None.
+    seed (int): Seed for a private random generator, the global one if None.
+    stats (dict): If given, filled with flips, tries, seconds and flips_per_second.
+    should_stop (callable): Polled periodically; the search gives up when it returns True.
+
+    Returns:
+    dict: A solution if found, else None.
+    """
+    if method not in ('walksat', 'probsat'):
+        raise ValueError(f"Unknown method: {method}")
+    rng = random.Random(seed) if seed is not None else random
+    n = max(abs(literal) for clause in k_sat for literal in clause)
+    start_time = time.perf_counter()
+    deadline = None if time_limit is None else start_time + time_limit
+    total_flips = 0
+    tries = 0
+    solution = None
+
+    while solution is None and (max_tries is None or tries < max_tries):
+        tries += 1
+        state = SATState(k_sat, {var: rng.random() < 0.5 for var in range(1, n + 1)}, track_scores=False)
+        clauses = state.clauses
+        unsat_clauses = state.unsat_clauses
+        breaks = state.breaks
+        flip = state.flip
+        uniform = rng.random
+        if method == 'probsat':
+            # Break values are small integers, so the weights are looked up.
+            max_break = max((len(occurrences) for occurrences in state.occurrences), default=0)
+            weights = [(eps + value) ** -cb for value in range(max_break + 1)]
+
+        flips = 0
+        stopped = False
+        while flips < max_flips:
+            if not unsat_clauses:
+                solution = state.assignment()
+                break
+            if flips & 1023 == 0 and flips:
+                if deadline is not None and time.perf_counter() > deadline:
+                    stopped = True
+                    break
+                if should_stop is not None and should_stop():
+                    stopped = True
+                    break
+
+            clause = clauses[unsat_clauses[int(uniform() * len(unsat_clauses))]]
+            if method == 'probsat':
+                clause_weights = [weights[breaks[abs(literal)]] for literal in clause]
+                threshold = uniform() * sum(clause_weights)
+                for literal, weight in zip(clause, clause_weights):
+                    threshold -= weight
+                    if threshold <= 0:
+                        break
+                var = abs(literal)
+            else:
+                best_var, best_break = 0, None
+                for literal in clause:
+                    value = breaks[abs(literal)]
+                    if best_break is None or value < best_break:
+                        best_var, best_break = abs(literal), value
+                if best_break == 0 or uniform() >= noise:
+                    var = best_var
+                else:
+                    var = abs(clause[int(uniform() * len(clause))])
+
+            flip(var)
+            flips += 1
+
+        # The last allowed flip may have satisfied the formula.
+        if solution is None and not stopped and not unsat_clauses:
+            solution = state.assignment()
+        total_flips += flips
+        if stopped:
+            break
+
+    if stats is not None:
+        seconds = time.perf_counter() - start_time
+        stats.update({
+            'flips': total_flips,
+            'tries': tries,
+            'seconds': seconds,
+            'flips_per_second': total_flips / seconds if seconds > 0 else 0.0,
+            'solved': solution is not None,
+        })
+    return solution
+
+if __name__ == "__main__":
+    from lab3_a import generate_k_sat, heuristic_satisfied_clauses
+
+    for n in (500, 1000, 2000):
+        m = int(4.2 * n)
+        k_sat_problem = generate_k_sat(3, m, n)
+        for method in ('walksat', 'probsat'):
+            stats = {}
+            solution = walksat(k_sat_problem, method=method, time_limit=60, stats=stats)
+            satisfied = heuristic_satisfied_clauses(solution, k_sat_problem) if solution else None
+            print(f"n={n} m={m} {method}: satisfied={satisfied}, flips={stats['flips']}, "
+                  f"{stats['flips_per_second']:,.0f} flips/s, {stats['seconds']:.2f} s")
@@ -0,0 +1,115 @@
+import time
+
+import numpy as np
+
+from tsp_local_search import tour_cost
+
+def swap_deltas(distances, tours, i, j):
+    # Cost change of swapping positions i and j in every tour at once.
+    batch, n = tours.shape
+    base = np.arange(batch) * n
+    flat = tours.ravel()
+    ti, tj = flat[base + i], flat[base + j]
+    pi, ni = flat[base + (i - 1) % n], flat[base + (i + 1) % n]
+    pj, nj = flat[base + (j - 1) % n], flat[base + (j + 1) % n]
+    deltas = (distances[pi, tj] + distances[tj, ni] + distances[pj, ti] + distances[ti, nj]
+              - distances[pi, ti] - distances[ti, ni] - distances[pj, tj] - distances[tj, nj])
+    # With a zero diagonal, the formula for distant positions is off by the
+    # shared edge in both directions once per adjacency (twice when n == 2).
+    adjacent = (ni == tj).astype(np.int64) + (nj == ti)
+    return deltas + adjacent * (distances[ti, tj] + distances[tj, ti])
+
+def two_opt_deltas(distances, tours, i, j):
+    # Cost change of reversing tours[:, i..j] (i < j) in every tour at once.
+    batch, n = tours.shape
+    base = np.arange(batch) * n
+    flat = tours.ravel()
+    a, b = flat[base + (i - 1) % n], flat[base + i]
+    c, d = flat[base + j], flat[base + (j + 1) % n]
+    deltas = distances[a, c] + distances[b, d] - distances[a, b] - distances[c, d]
+    return np.where(j - i + 1 >= n - 1, 0, deltas)
+
+def apply_swaps(tours, rows, i, j):
+    first = tours[rows, i]
+    tours[rows, i] = tours[rows, j]
+    tours[rows, j] = first
+
+def apply_two_opts(tours, rows, i, j):
+    # Reversals of different lengths done as one gather: position p in [i, j] reads i + j - p.
+    positions = np.arange(tours.shape[1])
+    inside = (positions >= i[:, np.newaxis]) & (positions <= j[:, np.newaxis])
+    source = np.where(inside, i[:, np.newaxis] + j[:, np.newaxis] - positions, positions)
+    tours[rows] = np.take_along_axis(tours[rows], source, axis=1)
+
+BATCHED_MOVES = {
+    'swap': (swap_deltas, apply_swaps),
+    'two_opt': (two_opt_deltas, apply_two_opts),
+}
+
+def batched_annealing(distance_matrix, batch_size=256, initial_temp=1000, cooling_rate=0.995, num_iterations=10000,
+                      move='swap', seed=None, stats=None):
+    # batch_size independent annealing chains held as one (B, n) array and
+    # stepped in lock step: one proposal per chain, vectorized deltas and one
+    # vectorized Metropolis test. initial_temp may also be an array of B
+    # starting temperatures. Returns (best tour, best cost, best cost of every chain).
+    # If stats is given, stats['best_trace'] gets (seconds, cost) whenever the best over all chains improves.
+    start_time = time.perf_counter()
+    if move not in BATCHED_MOVES:
+        raise ValueError(f"Unknown batched move {move!r}; supported moves: {', '.join(sorted(BATCHED_MOVES))}")
+    move_deltas, apply_moves = BATCHED_MOVES[move]
+    rng = np.random.default_rng(seed)
+    n = len(distance_matrix)
+    tours = rng.permuted(np.tile(np.arange(n), (batch_size, 1)), axis=1)
+    costs = np.array([tour_cost(tour, distance_matrix) for tour in tours])
+    best_tours = tours.copy()
+    best_costs = costs.copy()
+    overall_best = float(best_costs.min())
+    best_trace = [(time.perf_counter() - start_time, overall_best)]
+    temperature = np.broadcast_to(np.asarray(initial_temp, dtype=np.float64), (batch_size,)).copy()
+
+    # Random numbers are drawn for a block of steps at a time.
+    block = max(1, min(num_iterations, (1 << 18) // batch_size))
+    for block_start in range(0, num_iterations, block):
+        steps = min(block, num_iterations - block_start)
+        first = rng.integers(n, size=(steps, batch_size))
+        second = (first + rng.integers(1, n, size=(steps, batch_size))) % n
+        uniforms = rng.random((steps, batch_size))
+
+        for step in range(steps):
+            i, j = first[step], second[step]
+            if move == 'two_opt':
+                i, j = np.minimum(i, j), np.maximum(i, j)
+            deltas = move_deltas(distance_matrix, tours, i, j)
+
+            # exp of a non-positive exponent never overflows; downhill moves pass anyway.
+            accept = (deltas < 0) | (uniforms[step] < np.exp(np.minimum(0, -deltas / temperature)))
+            rows = np.flatnonzero(accept)
+            if len(rows):
+                apply_moves(tours, rows, i[rows], j[rows])
+                costs[rows] += deltas[rows]
+                improved = rows[costs[rows] < best_costs[rows]]
+                best_tours[improved] = tours[improved]
+                best_costs[improved] = costs[improved]
+                if stats is not None and len(improved) and costs[improved].min() < overall_best:
+                    overall_best = float(costs[improved].min())
+                    best_trace.append((time.perf_counter() - start_time, overall_best))
+
+            temperature *= cooling_rate
+
+    # Re-sum the winners so the running sums' rounding does not leak out.
+    best_costs = np.array([tour_cost(tour, distance_matrix) for tour in best_tours])
+    best = int(np.argmin(best_costs))
+    if stats is not None:
+        stats['best_trace'] = best_trace
+    return best_tours[best], float(best_costs[best]), best_costs
+
+if __name__ == "__main__":
+    from tsp_distances import build_distance_matrix
+
+    locations = np.random.default_rng(0).random((20, 2)) * 10
+    distance_matrix = build_distance_matrix(locations)
+    for batch_size in (1, 16, 256, 1024):
+        start_time = time.perf_counter()
+        tour, cost, chain_costs = batched_annealing(distance_matrix, batch_size=batch_size, seed=0)
+        print(f"B={batch_size:>5}: {time.perf_counter() - start_time:6.2f} s, best {cost:.3f}, "
+              f"median chain {np.median(chain_costs):.3f}")
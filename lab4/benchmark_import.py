@@ -0,0 +1,58 @@
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+
+# Each case runs in a fresh interpreter, as a new worker process would.
+CASES = {
+    'interpreter only': "pass",
+    'import lab4_a': "import lab4_a",
+    'import numpy + matplotlib.pyplot': "import numpy, matplotlib.pyplot",
+}
+
+def baseline_module(revision, directory):
+    # Write lab4_a.py as it was at `revision` into directory; False if git cannot provide it.
+    result = subprocess.run(['git', 'show', f'{revision}:./lab4_a.py'], cwd=DIRECTORY, capture_output=True)
+    if result.returncode != 0:
+        return False
+    with open(os.path.join(directory, 'lab4_a.py'), 'wb') as file:
+        file.write(result.stdout)
+    return True
+
+def time_case(code, repeats, directory=DIRECTORY):
+    environment = dict(os.environ, MPLBACKEND='Agg')
+    timings = []
+    for _ in range(repeats):
+        start_time = time.perf_counter()
+        subprocess.run([sys.executable, '-c', code], check=True, cwd=directory, env=environment,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        timings.append(time.perf_counter() - start_time)
+    return statistics.median(timings)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure cold-start import time of the lab4 TSP module.")
+    parser.add_argument('--repeats', type=int, default=7)
+    parser.add_argument('--baseline', default='9d582a6',
+                        help="git revision whose lab4_a.py (the eager script) is imported for comparison")
+    args = parser.parse_args()
+
+    timings = {name: time_case(code, args.repeats) for name, code in CASES.items()}
+    with tempfile.TemporaryDirectory() as directory:
+        # The old module imported on its own: pyplot, a solve and the plot call all ran at import.
+        if baseline_module(args.baseline, directory):
+            timings[f'import lab4_a at {args.baseline}'] = time_case("import lab4_a", args.repeats, directory)
+        else:
+            print(f"Revision {args.baseline} is not available; reporting the current module only.")
+
+    interpreter = timings['interpreter only']
+    for name, seconds in timings.items():
+        print(f"{name:34} {seconds * 1e3:8.1f} ms  ({(seconds - interpreter) * 1e3:7.1f} ms over the interpreter)")
+    previous = timings.get(f'import lab4_a at {args.baseline}')
+    if previous is not None:
+        saved = previous - timings['import lab4_a']
+        print(f"Cold start saved per worker: {saved * 1e3:.1f} ms ({previous / timings['import lab4_a']:.1f}x faster)")
@@ -0,0 +1,172 @@
+import argparse
+import json
+import platform
+import random
+import statistics
+import time
+
+import numpy as np
+
+from batched_annealing import batched_annealing
+from lab4_a import simulated_annealing
+from parallel_tempering import parallel_tempering, temperature_ladder
+from tsp_local_search import TourImprover, nearest_neighbor_tour, neighbor_lists, tour_cost
+from tsplib import bundled_instances, known_optima, load_instance
+
+def _annealing_schedule(distance_matrix, move, iterations, final_ratio, seed):
+    # Start where about half of the uphill moves of a random tour pass and cool
+    # geometrically to final_ratio of that by the last iteration.
+    initial_temp = temperature_ladder(distance_matrix, 1, move, hot_acceptance=0.5, cold_ratio=1.0, seed=seed)[0]
+    return initial_temp, final_ratio ** (1 / iterations)
+
+def _shift(trace, offset):
+    return [(offset + seconds, cost) for seconds, cost in trace]
+
+# Every configuration maps (distance matrix, arguments, seed, start time) to a
+# tour and a (seconds, cost) trace of its best cost, recorded at every
+# improvement. Seconds count from the start time, taken once the distance
+# matrix exists, so set-up such as a temperature schedule or a starting tour
+# is included the same way everywhere.
+
+def _annealing(move, polish=False):
+    def solve(distance_matrix, args, seed, start_time):
+        random.seed(seed)
+        np.random.seed(seed)
+        initial_temp, cooling_rate = _annealing_schedule(distance_matrix, move, args.iterations, args.final_ratio, seed)
+        stats = {}
+        offset = time.perf_counter() - start_time
+        tour, _ = simulated_annealing(distance_matrix, initial_temp, cooling_rate, args.iterations, move, polish, stats)
+        return tour, _shift(stats['best_trace'], offset)
+    return solve
+
+def _local_search(distance_matrix, args, seed, start_time):
+    # Nearest neighbour from a seeded start city, then 2-opt / Or-opt to a local optimum.
+    neighbors = neighbor_lists(distance_matrix, 10)
+    start = random.Random(seed).randrange(len(distance_matrix))
+    initial = nearest_neighbor_tour(distance_matrix, neighbors, start)
+    improver = TourImprover(initial, distance_matrix, neighbors)
+    offset = time.perf_counter() - start_time
+    initial_sample = (offset, improver.cost)
+    trace = improver.run(trace_interval=0)
+    return improver.tour, [initial_sample] + _shift([(seconds, cost) for seconds, cost, _ in trace], offset)
+
+def _batched(distance_matrix, args, seed, start_time):
+    initial_temp, cooling_rate = _annealing_schedule(distance_matrix, 'two_opt', args.iterations, args.final_ratio, seed)
+    stats = {}
+    offset = time.perf_counter() - start_time
+    tour, _, _ = batched_annealing(distance_matrix, args.batch_size, initial_temp, cooling_rate, args.iterations,
+                                   'two_opt', seed, stats)
+    return tour, _shift(stats['best_trace'], offset)
+
+def _parallel_tempering(distance_matrix, args, seed, start_time):
+    offset = time.perf_counter() - start_time
+    tour, _, stats = parallel_tempering(distance_matrix, time_limit=args.time_limit, seed=seed)
+    return tour, _shift(stats['best_trace'], offset)
+
+CONFIGURATIONS = {
+    'sa_swap': _annealing('swap'),
+    'sa_two_opt': _annealing('two_opt'),
+    'sa_two_opt_polish': _annealing('two_opt', polish=True),
+    'nn_local_search': _local_search,
+    'batched_two_opt': _batched,
+    'parallel_tempering': _parallel_tempering,
+}
+
+def time_to_target(trace, target_cost):
+    # Seconds until the best cost first reached the target, None if it never did.
+    return next((seconds for seconds, cost in trace if cost <= target_cost), None)
+
+def run_configuration(configuration, distance_matrix, optimum, args, seed):
+    start_time = time.perf_counter()
+    tour, trace = CONFIGURATIONS[configuration](distance_matrix, args, seed, start_time)
+    seconds = time.perf_counter() - start_time
+    if sorted(np.asarray(tour).tolist()) != list(range(len(distance_matrix))):
+        raise RuntimeError(f"{configuration} returned a tour that is not a permutation")
+    cost = tour_cost(tour, distance_matrix)
+    return {'seed': seed, 'seconds': seconds, 'cost': cost, 'gap': cost / optimum - 1,
+            'time_to_target': time_to_target(trace, optimum * (1 + args.target_gap))}
+
+def summarize(runs):
+    # The median time-to-target counts missed targets as infinitely slow, so it
+    # is None once half of the runs miss.
+    times = [float('inf') if run['time_to_target'] is None else run['time_to_target'] for run in runs]
+    median_time = statistics.median(times)
+    return {
+        'success_rate': sum(value != float('inf') for value in times) / len(runs),
+        'median_time_to_target': median_time if median_time != float('inf') else None,
+        'median_gap': statistics.median(run['gap'] for run in runs),
+        'best_gap': min(run['gap'] for run in runs),
+        'median_seconds': statistics.median(run['seconds'] for run in runs),
+        'runs': runs,
+    }
+
+def compare(results, baseline_path, tolerance, gap_tolerance):
+    # Print the cells that got slower, reach the target less often or end further from the optimum.
+    with open(baseline_path) as file:
+        baseline = {(cell['configuration'], cell['instance']): cell for cell in json.load(file)['results']}
+    regressions = 0
+    for cell in results:
+        old = baseline.get((cell['configuration'], cell['instance']))
+        if old is None:
+            continue
+        old_time, new_time = old['median_time_to_target'], cell['median_time_to_target']
+        slower = old_time is not None and (new_time is None or new_time > old_time * (1 + tolerance))
+        worse = cell['median_gap'] > old['median_gap'] + gap_tolerance
+        if slower or worse or cell['success_rate'] < old['success_rate']:
+            regressions += 1
+            print(f"REGRESSION {cell['configuration']} on {cell['instance']}: "
+                  f"success {old['success_rate']:.2f} -> {cell['success_rate']:.2f}, "
+                  f"median gap {old['median_gap']:.4f} -> {cell['median_gap']:.4f}, "
+                  f"median time to target {old_time} -> {new_time}")
+    print(f"{regressions} regressions against {baseline_path}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the TSP solvers on TSPLIB instances with known optima "
+                                                 "and record optimality gaps and time-to-target.")
+    parser.add_argument('--instances', nargs='+', default=bundled_instances(),
+                        help="bundled instance names (default: all of them)")
+    parser.add_argument('--configurations', nargs='+', choices=sorted(CONFIGURATIONS), default=list(CONFIGURATIONS))
+    parser.add_argument('--runs', type=int, default=3, help="seeded runs per configuration and instance")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--iterations', type=int, default=100000, help="annealing steps per chain")
+    parser.add_argument('--final-ratio', type=float, default=1e-3,
+                        help="final over initial temperature of the annealing schedules")
+    parser.add_argument('--batch-size', type=int, default=64)
+    parser.add_argument('--time-limit', type=float, default=10.0, help="parallel tempering budget in seconds")
+    parser.add_argument('--target-gap', type=float, default=0.05, help="a run hits the target within this gap")
+    parser.add_argument('--output', default='tsplib_results.json')
+    parser.add_argument('--baseline', help="earlier results file to check for regressions")
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help="allowed relative slowdown of the median time-to-target")
+    parser.add_argument('--gap-tolerance', type=float, default=0.01,
+                        help="allowed increase of the median gap")
+    args = parser.parse_args()
+
+    optima = known_optima()
+    results = []
+    for instance in args.instances:
+        problem, distance_matrix, _ = load_instance(instance)
+        optimum = optima[instance]
+        for configuration in args.configurations:
+            runs = [run_configuration(configuration, distance_matrix, optimum, args, args.seed + run)
+                    for run in range(args.runs)]
+            cell = dict(configuration=configuration, instance=instance, n=problem['DIMENSION'],
+                        edge_weight_type=problem['EDGE_WEIGHT_TYPE'], optimum=optimum, **summarize(runs))
+            results.append(cell)
+            median_time = cell['median_time_to_target']
+            print(f"{instance:>8} {configuration:>18}: median gap {cell['median_gap']:+.2%}, "
+                  f"best {cell['best_gap']:+.2%}, success {cell['success_rate']:.2f}, "
+                  f"median time to target {'-' if median_time is None else f'{median_time:.2f} s':>8}")
+
+    with open(args.output, 'w') as file:
+        json.dump({
+            'config': vars(args),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'machine': platform.machine(),
+            'results': results,
+        }, file, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.baseline:
+        compare(results, args.baseline, args.tolerance, args.gap_tolerance)
@@ -1,6 +1,14 @@
+import argparse
+import csv
+import json
+import math
 import numpy as np
-import matplotlib.pyplot as plt
 import random
+import time
+
+from tsp_distances import build_distance_matrix
+from tsp_local_search import two_opt_or_opt
+from tsp_moves import MOVES, move_functions
 
 locations = {
     'Jaipur': (26.9124, 75.7873),
@@ -25,73 +33,132 @@ locations = {
     'Jhalawar': (23.5962, 76.1665)
 }
 
-def calculate_distance_matrix(locations):
-    n = len(locations)
-    distance_matrix = np.zeros((n, n))
-    location_list = list(locations.values())
-    
-    for i in range(n):
-        for j in range(n):
-            if i != j:
-                distance = np.sqrt((location_list[i][0] - location_list[j][0]) ** 2 +
-                                   (location_list[i][1] - location_list[j][1]) ** 2)
-                distance_matrix[i][j] = distance
-    return distance_matrix
+def calculate_distance_matrix(locations, metric='euclidean'):
+    # metric='haversine' gives great-circle kilometres from the (latitude, longitude) pairs.
+    return build_distance_matrix(locations, metric)
 
-def simulated_annealing(distance_matrix, initial_temp=1000, cooling_rate=0.995, num_iterations=10000):
+def simulated_annealing(distance_matrix, initial_temp=1000, cooling_rate=0.995, num_iterations=10000, move='swap',
+                        polish=False, stats=None):
+    # If stats is given, stats['best_trace'] gets (seconds, cost) whenever the best cost improves, polish included.
+    start_time = time.perf_counter()
     n = len(distance_matrix)
+    propose, move_delta, apply_move = move_functions(move, n)
     current_solution = np.random.permutation(n)
     current_cost = calculate_cost(current_solution, distance_matrix)
     
     best_solution = np.copy(current_solution)
     best_cost = current_cost
+    best_trace = [(time.perf_counter() - start_time, best_cost)]
     
     temperature = initial_temp
     
     for iteration in range(num_iterations):
-        new_solution = np.copy(current_solution)
-        i, j = random.sample(range(n), 2)
-        new_solution[i], new_solution[j] = new_solution[j], new_solution[i]
-        
-        new_cost = calculate_cost(new_solution, distance_matrix)
+        # Only the edges touched by the move are priced; the tour changes in place when accepted.
+        proposal = propose(n)
+        delta = move_delta(current_solution, distance_matrix, *proposal)
         
-        if new_cost < current_cost or random.uniform(0, 1) < np.exp((current_cost - new_cost) / temperature):
-            current_solution = new_solution
-            current_cost = new_cost
+        if delta < 0 or random.uniform(0, 1) < math.exp(-delta / temperature):
+            apply_move(current_solution, *proposal)
+            current_cost += delta
             
             if current_cost < best_cost:
                 best_solution = np.copy(current_solution)
                 best_cost = current_cost
+                if stats is not None:
+                    best_trace.append((time.perf_counter() - start_time, best_cost))
         
         temperature *= cooling_rate
     
-    return best_solution, best_cost
+    if polish:
+        # Deterministic 2-opt / Or-opt descent removes the crossings the annealer leaves.
+        polish_start = time.perf_counter() - start_time
+        best_solution, _, polish_trace = two_opt_or_opt(best_solution, distance_matrix,
+                                                        trace_interval=0 if stats is not None else 0.1)
+        best_trace.extend((polish_start + seconds, cost) for seconds, cost, _ in polish_trace)
+    
+    if stats is not None:
+        stats['best_trace'] = best_trace
+    return best_solution, calculate_cost(best_solution, distance_matrix)
 
 def calculate_cost(solution, distance_matrix):
-    total_cost = 0
-    for i in range(len(solution)):
-        total_cost += distance_matrix[solution[i], solution[(i + 1) % len(solution)]]
-    return total_cost
+    # Works for a dense matrix and for CoordinateDistances alike.
+    return float(np.sum(distance_matrix[solution, np.roll(solution, -1)], dtype=np.float64))
 
-def plot_route(solution, locations):
+def load_locations(file_path):
+    # CSV rows of name, latitude, longitude (a header row is skipped), or JSON
+    # as {name: [latitude, longitude]} or a list of {"name", "latitude", "longitude"}.
+    if file_path.lower().endswith('.json'):
+        with open(file_path) as file:
+            data = json.load(file)
+        if isinstance(data, dict):
+            return {name: (float(point[0]), float(point[1])) for name, point in data.items()}
+        return {entry['name']: (float(entry['latitude']), float(entry['longitude'])) for entry in data}
+
+    locations = {}
+    with open(file_path, newline='') as file:
+        for row in csv.reader(file):
+            if not row or row[0].startswith('#'):
+                continue
+            try:
+                locations[row[0].strip()] = (float(row[1]), float(row[2]))
+            except ValueError:
+                if locations:
+                    raise
+    return locations
+
+def plot_route(solution, locations, output_path=None, title='Optimal Route in Rajasthan'):
     location_list = list(locations.keys())
     route = [location_list[i] for i in solution] + [location_list[solution[0]]]
     
     x = [locations[city][0] for city in route]
     y = [locations[city][1] for city in route]
     
-    plt.figure(figsize=(10, 6))
-    plt.plot(x, y, marker='o')
-    plt.title('Optimal Route in Rajasthan')
-    plt.xlabel('Latitude')
-    plt.ylabel('Longitude')
+    # matplotlib is only imported here. With an output path the figure is
+    # drawn without pyplot, so no GUI backend is needed.
+    if output_path is not None:
+        from matplotlib.figure import Figure
+        figure = Figure(figsize=(10, 6))
+        axes = figure.subplots()
+    else:
+        import matplotlib.pyplot as plt
+        figure, axes = plt.subplots(figsize=(10, 6))
+    axes.plot(x, y, marker='o')
+    axes.set_title(title)
+    axes.set_xlabel('Latitude')
+    axes.set_ylabel('Longitude')
     for i, city in enumerate(route[:-1]):
-        plt.text(x[i], y[i], city, fontsize=9)
-    plt.show()
+        axes.text(x[i], y[i], city, fontsize=9)
+    if output_path is not None:
+        figure.savefig(output_path)
+    else:
+        plt.show()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Plan a tour through a set of locations with simulated annealing.")
+    parser.add_argument('--locations', help="CSV or JSON file of locations; the built-in Rajasthan set if omitted")
+    parser.add_argument('--metric', choices=['euclidean', 'haversine'], default='euclidean')
+    parser.add_argument('--iterations', type=int, default=10000)
+    parser.add_argument('--move', choices=sorted(MOVES), default='swap')
+    parser.add_argument('--no-polish', action='store_true', help="skip the 2-opt / Or-opt stage")
+    parser.add_argument('--seed', type=int)
+    parser.add_argument('--output', help="save the route plot to this file instead of showing it")
+    parser.add_argument('--no-plot', action='store_true')
+    args = parser.parse_args(argv)
 
-distance_matrix = calculate_distance_matrix(locations)
-best_solution, best_cost = simulated_annealing(distance_matrix)
-print("Best Route:", [list(locations.keys())[i] for i in best_solution])
-print("Minimum Cost:", best_cost)
+    if args.seed is not None:
+        random.seed(args.seed)
+        np.random.seed(args.seed)
+    tour_locations = load_locations(args.locations) if args.locations else locations
+    distance_matrix = calculate_distance_matrix(tour_locations, args.metric)
+    best_solution, best_cost = simulated_annealing(distance_matrix, num_iterations=args.iterations, move=args.move,
+                                                   polish=not args.no_polish)
+    print("Best Route:", [list(tour_locations.keys())[i] for i in best_solution])
+    print("Minimum Cost:", best_cost)
+
+    if not args.no_plot:
+        title = 'Optimal Route' if args.locations else 'Optimal Route in Rajasthan'
+        plot_route(best_solution, tour_locations, args.output, title)
+    return best_solution, best_cost
 
-plot_route(best_solution, locations)
+if __name__ == "__main__":
+    main()
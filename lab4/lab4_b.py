@@ -13,21 +13,32 @@ def load_image(file_path):
     return image
 
 def split_image(image, piece_size):
+    # One contiguous (P, piece_size, piece_size) array, pieces in row-major grid order.
     h, w = image.shape
-    pieces = [image[i:i+piece_size, j:j+piece_size] 
-              for i in range(0, h, piece_size) 
-              for j in range(0, w, piece_size)]
-    return pieces
-
-def reconstruct_image(pieces, grid_size):
-    return np.block([[pieces[i*grid_size + j] for j in range(grid_size)] 
-                     for i in range(grid_size)])
+    if h % piece_size or w % piece_size:
+        raise ValueError("Image size must be a multiple of the piece size")
+    rows, cols = h // piece_size, w // piece_size
+    return np.ascontiguousarray(image.reshape(rows, piece_size, cols, piece_size).transpose(0, 2, 1, 3)
+                                .reshape(rows * cols, piece_size, piece_size))
+
+def reconstruct_image(pieces, grid_size, order=None, out=None):
+    # Position p shows piece order[p] (the pieces as stored if order is None).
+    # The grid is written through a (row, col, y, x) view of the output buffer.
+    pieces = np.asarray(pieces)
+    piece_size = pieces.shape[1]
+    if out is None:
+        out = np.empty((grid_size * piece_size, grid_size * piece_size), dtype=pieces.dtype)
+    blocks = out.reshape(grid_size, piece_size, grid_size, piece_size).transpose(0, 2, 1, 3)
+    arranged = pieces if order is None else pieces[order]
+    blocks[...] = arranged.reshape(grid_size, grid_size, piece_size, piece_size)
+    return out
 
 def edge_difference(piece1, piece2, edge):
+    # Widen before subtracting: uint8 differences wrap around instead of going negative.
     if edge == 'right':
-        return np.sum(np.abs(piece1[:, -1] - piece2[:, 0]))
+        return np.sum(np.abs(piece1[:, -1].astype(np.int32) - piece2[:, 0]))
     elif edge == 'bottom':
-        return np.sum(np.abs(piece1[-1, :] - piece2[0, :]))
+        return np.sum(np.abs(piece1[-1, :].astype(np.int32) - piece2[0, :]))
     else:
         raise ValueError("Invalid edge")
 
@@ -43,6 +54,48 @@ def calculate_energy(pieces, grid_size):
                                           pieces[(i+1)*grid_size + j], 'bottom')
     return energy
 
+def compatibility_tables(pieces):
+    # right[a, b] is the edge difference of piece b placed right of piece a,
+    # bottom[a, b] of piece b placed below a; P x P float32, computed once.
+    stacked = np.asarray(pieces, dtype=np.float32)
+    right = np.abs(stacked[:, np.newaxis, :, -1] - stacked[np.newaxis, :, :, 0]).sum(axis=-1)
+    bottom = np.abs(stacked[:, np.newaxis, -1, :] - stacked[np.newaxis, :, 0, :]).sum(axis=-1)
+    return right, bottom
+
+def table_energy(order, grid_size, right, bottom):
+    # Energy of the arrangement where position p holds piece order[p].
+    grid = np.asarray(order).reshape(grid_size, grid_size)
+    return float(right[grid[:, :-1], grid[:, 1:]].sum(dtype=np.float64)
+                 + bottom[grid[:-1], grid[1:]].sum(dtype=np.float64))
+
+def affected_edges(i, j, grid_size):
+    # (left or top position, right or bottom position, is_right) of the at most
+    # 8 adjacencies touching positions i and j; a set, so a shared edge counts once.
+    edges = set()
+    for index in (i, j):
+        row, col = divmod(index, grid_size)
+        if col > 0:
+            edges.add((index - 1, index, True))
+        if col < grid_size - 1:
+            edges.add((index, index + 1, True))
+        if row > 0:
+            edges.add((index - grid_size, index, False))
+        if row < grid_size - 1:
+            edges.add((index, index + grid_size, False))
+    return edges
+
+def swap_delta(order, i, j, grid_size, right, bottom):
+    # Energy change of swapping the pieces at positions i and j, from table lookups only.
+    # .item() reads plain Python numbers, cheaper than numpy scalars one at a time.
+    piece_i, piece_j = order.item(i), order.item(j)
+    def piece_at(position):
+        return piece_j if position == i else piece_i if position == j else order.item(position)
+    delta = 0.0
+    for first, second, is_right in affected_edges(i, j, grid_size):
+        table = right if is_right else bottom
+        delta += table.item(piece_at(first), piece_at(second)) - table.item(order.item(first), order.item(second))
+    return delta
+
 def get_neighbors(index, grid_size):
     row, col = divmod(index, grid_size)
     neighbors = []
@@ -57,28 +110,31 @@ def get_neighbors(index, grid_size):
     return neighbors
 
 def simulated_annealing(pieces, grid_size, initial_temp, cooling_rate, iterations):
-    current_solution = pieces.copy()
-    current_energy = calculate_energy(current_solution, grid_size)
-    best_solution = current_solution.copy()
+    # The state is an int16 permutation, order[p] being the piece at position p,
+    # swapped in place; a proposal is priced from the precomputed tables without
+    # building the new arrangement. Returns (best order, best energy).
+    right, bottom = compatibility_tables(pieces)
+    num_pieces = len(pieces)
+    current_order = np.arange(num_pieces, dtype=np.int16)
+    current_energy = table_energy(current_order, grid_size, right, bottom)
+    best_order = current_order.copy()
     best_energy = current_energy
     temp = initial_temp
 
     for iter in range(iterations):
         # Choose a random piece and one of its neighbors
-        i = random.randint(0, len(pieces) - 1)
+        i = random.randint(0, num_pieces - 1)
         neighbors = get_neighbors(i, grid_size)
-        j = random.choice(neighbors) if neighbors else random.randint(0, len(pieces) - 1)
+        j = random.choice(neighbors) if neighbors else random.randint(0, num_pieces - 1)
 
-        new_solution = current_solution.copy()
-        new_solution[i], new_solution[j] = new_solution[j], new_solution[i]
-        new_energy = calculate_energy(new_solution, grid_size)
+        delta = swap_delta(current_order, i, j, grid_size, right, bottom)
         
-        if new_energy < current_energy or random.random() < math.exp((current_energy - new_energy) / temp):
-            current_solution = new_solution
-            current_energy = new_energy
+        if delta < 0 or random.random() < math.exp(-delta / temp):
+            current_order[i], current_order[j] = current_order[j], current_order[i]
+            current_energy += delta
             
             if current_energy < best_energy:
-                best_solution = current_solution.copy()
+                best_order[:] = current_order
                 best_energy = current_energy
         
         # Cooling schedule
@@ -88,7 +144,8 @@ def simulated_annealing(pieces, grid_size, initial_temp, cooling_rate, iteration
         if iter % 1000 == 0 and iter > 0:
             temp = min(initial_temp, temp * 2)
 
-    return best_solution, best_energy
+    # Re-sum the best arrangement so rounding in the running energy does not leak out.
+    return best_order, table_energy(best_order, grid_size, right, bottom)
 
 def main():
     # Parameters
@@ -102,14 +159,15 @@ def main():
     # Load and process image
     image = load_image(file_path)
     pieces = split_image(image, piece_size)
-    random.shuffle(pieces)
+    # Scramble by permuting the piece array; random.shuffle on an ndarray swaps views and duplicates pieces.
+    pieces = pieces[np.random.permutation(len(pieces))]
 
     # Solve puzzle
-    solved_pieces, final_energy = simulated_annealing(pieces, grid_size, initial_temp, cooling_rate, iterations)
+    solved_order, final_energy = simulated_annealing(pieces, grid_size, initial_temp, cooling_rate, iterations)
 
     # Reconstruct and display images
     original_image = reconstruct_image(pieces, grid_size)
-    solved_image = reconstruct_image(solved_pieces, grid_size)
+    solved_image = reconstruct_image(pieces, grid_size, solved_order)
 
     plt.figure(figsize=(12, 6))
     plt.subplot(121)
@@ -0,0 +1,176 @@
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from tsp_local_search import tour_cost
+from tsp_moves import move_functions
+
+_distances = None
+_shared_block = None
+
+def _attach_distances(name, shape, dtype):
+    # Runs once per worker: map the parent's matrix instead of receiving a copy.
+    global _distances, _shared_block
+    _shared_block = shared_memory.SharedMemory(name=name)
+    _distances = np.ndarray(shape, dtype=dtype, buffer=_shared_block.buf)
+
+def _use_distances(distances):
+    global _distances
+    _distances = distances
+
+def run_chain(tour, temperature, steps, seed, move='two_opt'):
+    # Metropolis moves at a fixed temperature; returns the final tour and cost,
+    # the best tour seen, how many moves were accepted, and (perf_counter
+    # timestamp, cost) for every improvement of the chain's best. perf_counter
+    # is system-wide, so the parent can place the timestamps on its own clock.
+    random.seed(seed)
+    distances = _distances
+    tour = np.array(tour)
+    n = len(tour)
+    propose, move_delta, apply_move = move_functions(move, n)
+    cost = tour_cost(tour, distances)
+    best_tour, best_cost = tour.copy(), cost
+    accepted = 0
+    improvements = []
+
+    for _ in range(steps):
+        proposal = propose(n)
+        delta = move_delta(tour, distances, *proposal)
+        if delta < 0 or random.random() < math.exp(-delta / temperature):
+            apply_move(tour, *proposal)
+            cost += delta
+            accepted += 1
+            if cost < best_cost:
+                best_tour, best_cost = tour.copy(), cost
+                improvements.append((time.perf_counter(), cost))
+
+    # Re-sum once per segment so rounding in the running cost does not build up.
+    return tour, tour_cost(tour, distances), best_tour, tour_cost(best_tour, distances), accepted, improvements
+
+def temperature_ladder(distances, chains, move='two_opt', samples=1000, hot_acceptance=0.1, cold_ratio=1e-2,
+                       seed=0):
+    # Geometric ladder: the hottest chain accepts about hot_acceptance of the
+    # uphill moves of a random tour, the coldest is cold_ratio times cooler.
+    random_state = random.getstate()
+    random.seed(seed)
+    n = len(distances)
+    propose, move_delta, _ = move_functions(move, n)
+    tour = np.array(random.sample(range(n), n))
+    uphill = [delta for delta in (move_delta(tour, distances, *propose(n)) for _ in range(samples)) if delta > 0]
+    random.setstate(random_state)
+    hottest = -float(np.mean(uphill)) / math.log(hot_acceptance) if uphill else 1.0
+    if chains == 1:
+        return [hottest * cold_ratio]
+    return [hottest * cold_ratio ** (1 - index / (chains - 1)) for index in range(chains)]
+
+def parallel_tempering(distances, chains=8, temperatures=None, rounds=None, steps_per_round=2000, time_limit=60,
+                       workers=None, move='two_opt', seed=None):
+    # Replica exchange: each round every chain runs steps_per_round moves at its
+    # own temperature in the pool, then neighbouring temperatures try to swap
+    # tours with the usual acceptance exp((1/T_i - 1/T_j) (E_i - E_j)).
+    # Stops after `rounds` rounds or `time_limit` seconds, whichever comes first.
+    # Returns (best tour, best cost, stats).
+    start_time = time.perf_counter()
+    rng = random.Random(seed)
+    if temperatures is None:
+        temperatures = temperature_ladder(distances, chains, move, seed=rng.randrange(1 << 30))
+    temperatures = sorted(temperatures)
+    chains = len(temperatures)
+    n = len(distances)
+    workers = min(workers or os.cpu_count(), chains)
+
+    shared_block = None
+    if isinstance(distances, np.ndarray):
+        shared_block = shared_memory.SharedMemory(create=True, size=max(1, distances.nbytes))
+        shared_matrix = np.ndarray(distances.shape, dtype=distances.dtype, buffer=shared_block.buf)
+        shared_matrix[:] = distances
+        initializer, initargs = _attach_distances, (shared_block.name, distances.shape, distances.dtype.str)
+    else:
+        # On-demand distances are only O(n) and travel to each worker once.
+        initializer, initargs = _use_distances, (distances,)
+
+    tours = [np.array(rng.sample(range(n), n)) for _ in range(chains)]
+    costs = [tour_cost(tour, distances) for tour in tours]
+    best_tour, best_cost = tours[0].copy(), costs[0]
+    best_trace = [(time.perf_counter() - start_time, best_cost)]
+    accepted = [0] * chains
+    proposed = [0] * chains
+    chain_best = [float('inf')] * chains
+    swaps_attempted = [0] * (chains - 1)
+    swaps_accepted = [0] * (chains - 1)
+    completed = 0
+
+    try:
+        with ProcessPoolExecutor(workers, initializer=initializer, initargs=initargs) as executor:
+            while (rounds is None or completed < rounds) and \
+                    (time_limit is None or time.perf_counter() - start_time < time_limit):
+                futures = [executor.submit(run_chain, tours[index], temperatures[index], steps_per_round,
+                                           rng.randrange(1 << 30), move) for index in range(chains)]
+                events = []
+                for index, future in enumerate(futures):
+                    tour, cost, round_best_tour, round_best_cost, round_accepted, improvements = future.result()
+                    events.extend(improvements)
+                    tours[index], costs[index] = tour, cost
+                    accepted[index] += round_accepted
+                    proposed[index] += steps_per_round
+                    chain_best[index] = min(chain_best[index], round_best_cost)
+                    if round_best_cost < best_cost:
+                        best_tour, best_cost = round_best_tour, round_best_cost
+                # Chain improvements merged in time order give the overall best at step granularity.
+                for timestamp, event_cost in sorted(events):
+                    if event_cost < best_trace[-1][1]:
+                        best_trace.append((timestamp - start_time, event_cost))
+                completed += 1
+
+                # Alternate even and odd pairs so every pair gets a chance.
+                for index in range(completed % 2, chains - 1, 2):
+                    swaps_attempted[index] += 1
+                    exponent = (1 / temperatures[index] - 1 / temperatures[index + 1]) * (costs[index] - costs[index + 1])
+                    if exponent >= 0 or rng.random() < math.exp(exponent):
+                        tours[index], tours[index + 1] = tours[index + 1], tours[index]
+                        costs[index], costs[index + 1] = costs[index + 1], costs[index]
+                        swaps_accepted[index] += 1
+    finally:
+        if shared_block is not None:
+            shared_block.close()
+            shared_block.unlink()
+
+    stats = {
+        'seconds': time.perf_counter() - start_time,
+        'rounds': completed,
+        'workers': workers,
+        # (seconds, cost) whenever the overall best improves.
+        'best_trace': best_trace,
+        'chains': [{
+            'temperature': temperatures[index],
+            'proposed': proposed[index],
+            'accepted': accepted[index],
+            'acceptance_rate': accepted[index] / proposed[index] if proposed[index] else 0.0,
+            'best_cost': chain_best[index],
+        } for index in range(chains)],
+        'swaps': [{
+            'temperatures': (temperatures[index], temperatures[index + 1]),
+            'attempted': swaps_attempted[index],
+            'accepted': swaps_accepted[index],
+        } for index in range(chains - 1)],
+    }
+    return best_tour, best_cost, stats
+
+if __name__ == "__main__":
+    from tsp_distances import build_distance_matrix
+
+    n = 500
+    matrix = build_distance_matrix(np.random.default_rng(0).random((n, 2)))
+    tour, cost, stats = parallel_tempering(matrix, chains=8, time_limit=30, seed=0)
+    print(f"n={n}: best cost {cost:.3f} after {stats['rounds']} rounds in {stats['seconds']:.1f} s "
+          f"on {stats['workers']} workers")
+    for chain in stats['chains']:
+        print(f"  T={chain['temperature']:.5f}  acceptance {chain['acceptance_rate']:.3f}  best {chain['best_cost']:.3f}")
+    for swap in stats['swaps']:
+        print(f"  swap {swap['temperatures'][0]:.5f} <-> {swap['temperatures'][1]:.5f}: "
+              f"{swap['accepted']}/{swap['attempted']}")
@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+
+from batched_annealing import batched_annealing
+from lab4_a import calculate_cost, simulated_annealing
+from parallel_tempering import _use_distances, run_chain
+from tsp_distances import build_distance_matrix
+from tsp_moves import MOVES, move_functions
+
+@pytest.mark.parametrize('n', [2, 3])
+@pytest.mark.parametrize('move', sorted(MOVES))
+def test_small_tours_anneal_with_every_move(n, move):
+    distance_matrix = build_distance_matrix(np.random.default_rng(n).random((n, 2)))
+    tour, cost = simulated_annealing(distance_matrix, num_iterations=200, move=move, polish=True)
+    assert sorted(tour.tolist()) == list(range(n))
+    assert cost == pytest.approx(calculate_cost(tour, distance_matrix))
+
+    _use_distances(distance_matrix)
+    tour, cost, best_tour, best_cost, _, _ = run_chain(np.arange(n), 1.0, 200, seed=0, move=move)
+    assert sorted(best_tour.tolist()) == list(range(n))
+    assert best_cost == pytest.approx(calculate_cost(best_tour, distance_matrix))
+
+def test_or_opt_is_used_from_four_cities():
+    assert move_functions('or_opt', 4) is MOVES['or_opt']
+    assert move_functions('or_opt', 3) is MOVES['two_opt']
+
+def test_unknown_moves_are_rejected_with_the_supported_ones():
+    with pytest.raises(ValueError, match='two_opt'):
+        move_functions('three_opt', 10)
+    distance_matrix = build_distance_matrix(np.random.default_rng(0).random((10, 2)))
+    with pytest.raises(ValueError, match='swap, two_opt'):
+        batched_annealing(distance_matrix, batch_size=4, num_iterations=10, move='or_opt')
@@ -0,0 +1,109 @@
+import math
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0088
+
+def coordinate_array(locations):
+    # {name: (latitude, longitude)} in insertion order, or anything array-like of shape (n, 2).
+    if isinstance(locations, dict):
+        locations = list(locations.values())
+    return np.asarray(locations, dtype=np.float64).reshape(-1, 2)
+
+def pairwise_distances(first, second, metric='euclidean'):
+    # Distances between matching rows of two coordinate arrays (broadcasting allowed).
+    if metric == 'euclidean':
+        dx = first[..., 0] - second[..., 0]
+        dy = first[..., 1] - second[..., 1]
+        return np.sqrt(dx * dx + dy * dy)
+    if metric == 'haversine':
+        latitude_1, longitude_1 = np.radians(first[..., 0]), np.radians(first[..., 1])
+        latitude_2, longitude_2 = np.radians(second[..., 0]), np.radians(second[..., 1])
+        a = (np.sin((latitude_2 - latitude_1) / 2) ** 2
+             + np.cos(latitude_1) * np.cos(latitude_2) * np.sin((longitude_2 - longitude_1) / 2) ** 2)
+        return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+    raise ValueError(f"Unknown metric: {metric}")
+
+def build_distance_matrix(locations, metric='euclidean', dtype=np.float32, block_size=1024):
+    # Rows are computed in blocks, so the temporaries stay at block_size x n.
+    coordinates = coordinate_array(locations)
+    n = len(coordinates)
+    matrix = np.empty((n, n), dtype=dtype)
+    for start in range(0, n, block_size):
+        block = coordinates[start:start + block_size, np.newaxis, :]
+        matrix[start:start + block_size] = pairwise_distances(block, coordinates[np.newaxis, :, :], metric)
+    np.fill_diagonal(matrix, 0)
+    return matrix
+
+def nearest_neighbors(locations, k=10, metric='euclidean'):
+    # The k nearest other cities of every city, closest first, from a KD-tree.
+    coordinates = coordinate_array(locations)
+    n = len(coordinates)
+    k = min(k, n - 1)
+    if k <= 0:
+        return np.empty((n, 0), dtype=np.int32)
+    if metric == 'haversine':
+        # Chord length on the unit sphere orders neighbours exactly like great-circle distance.
+        latitude, longitude = np.radians(coordinates[:, 0]), np.radians(coordinates[:, 1])
+        points = np.column_stack([np.cos(latitude) * np.cos(longitude),
+                                  np.cos(latitude) * np.sin(longitude),
+                                  np.sin(latitude)])
+    elif metric == 'euclidean':
+        points = coordinates
+    else:
+        raise ValueError(f"Unknown metric: {metric}")
+    # scipy.spatial takes longer to import than everything else here, so only neighbour lists pay for it.
+    from scipy.spatial import cKDTree
+    _, indices = cKDTree(points).query(points, k=k + 1)
+    # Drop each city from its own list; duplicate points can push it out of
+    # the first column or out of the k + 1 results, then the last one goes.
+    own = indices == np.arange(n)[:, np.newaxis]
+    own[~own.any(axis=1), -1] = True
+    return indices[~own].reshape(n, k).astype(np.int32)
+
+class CoordinateDistances:
+    # Drop-in for a distance matrix that computes entries on demand, in O(n) memory.
+
+    def __init__(self, locations, metric='euclidean'):
+        self.coordinates = coordinate_array(locations)
+        if metric not in ('euclidean', 'haversine'):
+            raise ValueError(f"Unknown metric: {metric}")
+        self.metric = metric
+        # Plain floats keep the single-pair lookups of the annealer cheap.
+        self.latitudes = self.coordinates[:, 0].tolist()
+        self.longitudes = self.coordinates[:, 1].tolist()
+        if metric == 'haversine':
+            self.radian_latitudes = np.radians(self.coordinates[:, 0]).tolist()
+            self.radian_longitudes = np.radians(self.coordinates[:, 1]).tolist()
+            self.cos_latitudes = [math.cos(latitude) for latitude in self.radian_latitudes]
+        self._neighbors = {}
+
+    def __len__(self):
+        return len(self.coordinates)
+
+    @property
+    def shape(self):
+        return (len(self), len(self))
+
+    def distance(self, i, j):
+        if self.metric == 'euclidean':
+            return math.hypot(self.latitudes[i] - self.latitudes[j], self.longitudes[i] - self.longitudes[j])
+        a = (math.sin((self.radian_latitudes[j] - self.radian_latitudes[i]) / 2) ** 2
+             + self.cos_latitudes[i] * self.cos_latitudes[j]
+             * math.sin((self.radian_longitudes[j] - self.radian_longitudes[i]) / 2) ** 2)
+        return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(min(1.0, a)))
+
+    def __getitem__(self, index):
+        # distances[i, j] for two cities, or element-wise for two index arrays.
+        i, j = index
+        if np.ndim(i) == 0 and np.ndim(j) == 0:
+            return self.distance(i, j)
+        return pairwise_distances(self.coordinates[i], self.coordinates[j], self.metric)
+
+    def row(self, i):
+        return pairwise_distances(self.coordinates[i], self.coordinates, self.metric)
+
+    def neighbors(self, k=10):
+        if k not in self._neighbors:
+            self._neighbors[k] = nearest_neighbors(self.coordinates, k, self.metric)
+        return self._neighbors[k]
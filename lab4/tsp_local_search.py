@@ -0,0 +1,233 @@
+import time
+from collections import deque
+
+import numpy as np
+
+def neighbor_lists(distances, k=10):
+    # CoordinateDistances keeps its own KD-tree lists; a dense matrix is partitioned row block by row block.
+    if hasattr(distances, 'neighbors'):
+        return distances.neighbors(k)
+    matrix = np.asarray(distances)
+    n = len(matrix)
+    k = min(k, n - 1)
+    neighbors = np.empty((n, max(k, 0)), dtype=np.int32)
+    if k <= 0:
+        return neighbors
+    for start in range(0, n, 1024):
+        block = matrix[start:start + 1024].astype(np.float64)
+        block[np.arange(len(block)), np.arange(start, start + len(block))] = np.inf
+        closest = np.argpartition(block, k - 1, axis=1)[:, :k]
+        order = np.argsort(np.take_along_axis(block, closest, axis=1), axis=1, kind='stable')
+        neighbors[start:start + 1024] = np.take_along_axis(closest, order, axis=1)
+    return neighbors
+
+def distance_function(distances):
+    # Plain-float lookups; CoordinateDistances computes them, a matrix reads them.
+    if hasattr(distances, 'distance'):
+        return distances.distance
+    return np.asarray(distances).item
+
+def tour_cost(tour, distances):
+    tour = np.asarray(tour)
+    return float(np.sum(distances[tour, np.roll(tour, -1)], dtype=np.float64))
+
+def nearest_neighbor_tour(distances, neighbors, start=0):
+    # Greedy construction: the closest unvisited city from the neighbour list,
+    # falling back to a scan of all unvisited cities when the list is used up.
+    n = len(distances)
+    visited = np.zeros(n, dtype=bool)
+    tour = np.empty(n, dtype=np.int64)
+    city = start
+    for step in range(n):
+        tour[step] = city
+        visited[city] = True
+        if step == n - 1:
+            break
+        for candidate in neighbors[city]:
+            if not visited[candidate]:
+                city = int(candidate)
+                break
+        else:
+            unvisited = np.flatnonzero(~visited)
+            row = distances[np.full(len(unvisited), city), unvisited]
+            city = int(unvisited[np.argmin(row)])
+    return tour
+
+class TourImprover:
+    # 2-opt and Or-opt moves restricted to neighbour lists, driven by a queue
+    # of cities whose don't-look bit is off. The tour is an array with the
+    # position of every city alongside, so a 2-opt move is one slice reversal.
+
+    def __init__(self, tour, distances, neighbors=None, k=10):
+        self.n = len(tour)
+        self.tour = np.array(tour, dtype=np.int64)
+        self.position = np.empty(self.n, dtype=np.int64)
+        self.position[self.tour] = np.arange(self.n)
+        self.distance = distance_function(distances)
+        if neighbors is None:
+            neighbors = neighbor_lists(distances, k)
+        self.neighbors = [row.tolist() for row in np.asarray(neighbors)]
+        self.neighbor_distances = [[self.distance(city, other) for other in row]
+                                   for city, row in enumerate(self.neighbors)]
+        self.cost = tour_cost(self.tour, distances)
+        self.moves = {'two_opt': 0, 'or_opt': 0}
+
+    def next(self, city):
+        return self.tour.item((self.position.item(city) + 1) % self.n)
+
+    def previous(self, city):
+        return self.tour.item(self.position.item(city) - 1)
+
+    def _reverse(self, i, j):
+        # Reverse tour positions i..j, wrapping around the end; the shorter of
+        # the segment and its complement is reversed, which gives the same cycle.
+        n = self.n
+        length = (j - i) % n + 1
+        if 2 * length > n:
+            i, j = (j + 1) % n, (i - 1) % n
+            length = n - length
+        if length < 2:
+            return
+        if i <= j:
+            segment = self.tour[i:j + 1][::-1].copy()
+            self.tour[i:j + 1] = segment
+            self.position[segment] = np.arange(i, j + 1)
+        else:
+            positions = (i + np.arange(length)) % n
+            segment = self.tour[positions[::-1]]
+            self.tour[positions] = segment
+            self.position[segment] = positions
+
+    def _exchange(self, a, b, c, d):
+        # Replace edges (a, b) and (c, d) with (a, c) and (b, d), where b
+        # follows a and d follows c in the same direction.
+        if self.next(a) == b:
+            self._reverse(self.position.item(b), self.position.item(c))
+        else:
+            self._reverse(self.position.item(a), self.position.item(d))
+
+    def _two_opt(self, a):
+        # Best 2-opt move that adds an edge from a to one of its neighbours.
+        distance = self.distance
+        best_move = None
+        best_delta = -1e-10
+        for step in (self.next, self.previous):
+            b = step(a)
+            distance_ab = distance(a, b)
+            for c, distance_ac in zip(self.neighbors[a], self.neighbor_distances[a]):
+                if distance_ac >= distance_ab:
+                    break
+                d = step(c)
+                if c == b or d == a:
+                    continue
+                delta = distance_ac + distance(b, d) - distance_ab - distance(c, d)
+                if delta < best_delta:
+                    best_move, best_delta = (a, b, c, d), delta
+        if best_move is not None:
+            self._exchange(*best_move)
+            self.cost += best_delta
+            self.moves['two_opt'] += 1
+        return best_move
+
+    def _or_opt(self, a, max_segment=3):
+        # Move the segment of up to three cities starting at a between two
+        # adjacent cities near a, in either orientation.
+        distance = self.distance
+        n = self.n
+        start = self.position.item(a)
+        for length in range(1, min(max_segment, n - 3) + 1):
+            last = self.tour.item((start + length - 1) % n)
+            before, after = self.previous(a), self.next(last)
+            gain = distance(before, a) + distance(last, after) - distance(before, after)
+            if gain <= 1e-10:
+                continue
+            for c, distance_ac in zip(self.neighbors[a], self.neighbor_distances[a]):
+                if distance_ac >= gain:
+                    break
+                if (self.position.item(c) - start) % n < length:
+                    continue
+                for x, y in ((c, self.next(c)), (self.previous(c), c)):
+                    if (self.position.item(y) - start) % n < length or (self.position.item(x) - start) % n < length:
+                        continue
+                    forward = distance(x, a) + distance(last, y)
+                    backward = distance(x, last) + distance(a, y)
+                    delta = min(forward, backward) - distance(x, y) - gain
+                    if delta < -1e-10:
+                        # Three 2-opt exchanges: cut the segment out, close the gap, and straighten it if needed.
+                        self._exchange(before, a, x, y)
+                        self._exchange(before, x, after, last)
+                        if forward <= backward:
+                            self._exchange(x, last, a, y)
+                        self.cost += delta
+                        self.moves['or_opt'] += 1
+                        return (a, last, before, after, x, y)
+        return None
+
+    def run(self, time_limit=None, or_opt=True, reference_cost=None, trace_interval=0.1):
+        # Returns a trace of (seconds, cost, gap) samples; gap is relative to
+        # reference_cost and None without one. trace_interval=0 samples after
+        # every improving move.
+        start_time = time.perf_counter()
+        queue = deque(self.tour.tolist())
+        queued = [True] * self.n
+        trace = []
+        next_sample = 0.0
+        iterations = 0
+
+        def sample():
+            seconds = time.perf_counter() - start_time
+            gap = None if not reference_cost else self.cost / reference_cost - 1
+            trace.append((seconds, self.cost, gap))
+            return seconds
+
+        while queue:
+            iterations += 1
+            if iterations % 256 == 0:
+                seconds = time.perf_counter() - start_time
+                if seconds >= next_sample:
+                    sample()
+                    next_sample = seconds + trace_interval
+                if time_limit is not None and seconds > time_limit:
+                    break
+            a = queue.popleft()
+            queued[a] = False
+            changed = self._two_opt(a)
+            if changed is None and or_opt:
+                changed = self._or_opt(a)
+            if changed is not None:
+                if trace_interval == 0:
+                    sample()
+                # Cities at the ends of the changed edges may have new improving moves.
+                for city in changed:
+                    if not queued[city]:
+                        queued[city] = True
+                        queue.append(city)
+        sample()
+        return trace
+
+def two_opt_or_opt(tour, distances, k=10, or_opt=True, time_limit=None, reference_cost=None, trace_interval=0.1):
+    # Polish a tour; returns (tour, cost, trace).
+    improver = TourImprover(tour, distances, k=k)
+    trace = improver.run(time_limit, or_opt, reference_cost, trace_interval)
+    return improver.tour, improver.cost, trace
+
+if __name__ == "__main__":
+    from tsp_distances import CoordinateDistances
+
+    rng = np.random.default_rng(0)
+    for n in (1000, 5000, 20000):
+        # Beardwood-Halton-Hammersley estimate of the optimal tour length in the unit square;
+        # it ignores the boundary effect, so the gaps below are a little pessimistic.
+        reference = 0.7124 * np.sqrt(n) * (1 + 0.33 / n)
+        distances = CoordinateDistances(rng.random((n, 2)))
+        start_time = time.perf_counter()
+        neighbors = distances.neighbors(10)
+        initial = nearest_neighbor_tour(distances, neighbors)
+        setup_time = time.perf_counter() - start_time
+        initial_cost = tour_cost(initial, distances)
+        improver = TourImprover(initial, distances, neighbors)
+        trace = improver.run(reference_cost=reference)
+        print(f"n={n}: nearest neighbour {initial_cost / reference - 1:+.1%} in {setup_time:.2f} s, "
+              f"2-opt + Or-opt {trace[-1][2]:+.1%} after {trace[-1][0]:.2f} s more, moves {improver.moves}")
+        for seconds, cost, gap in trace[::max(1, len(trace) // 5)]:
+            print(f"  {seconds:7.2f} s  cost {cost:10.3f}  gap {gap:+.2%}")
@@ -0,0 +1,83 @@
+import random
+
+# Each move is proposed as a tuple of positions, priced from the few edges it
+# changes and applied to the tour in place. The distances can be a dense
+# matrix or anything indexable as distance_matrix[a, b].
+
+def propose_swap(n):
+    return tuple(random.sample(range(n), 2))
+
+def swap_delta(tour, distance_matrix, i, j):
+    n = len(tour)
+    # Edges leaving the positions before and at i and j; a set, so adjacent positions are not counted twice.
+    positions = {(i - 1) % n, i, (j - 1) % n, j}
+    old_cost = 0.0
+    new_cost = 0.0
+    for position in positions:
+        following = (position + 1) % n
+        old_cost += distance_matrix[tour[position], tour[following]]
+        start = tour[j] if position == i else tour[i] if position == j else tour[position]
+        end = tour[j] if following == i else tour[i] if following == j else tour[following]
+        new_cost += distance_matrix[start, end]
+    return float(new_cost - old_cost)
+
+def apply_swap(tour, i, j):
+    tour[i], tour[j] = tour[j], tour[i]
+
+def propose_two_opt(n):
+    i, j = random.sample(range(n), 2)
+    return (i, j) if i < j else (j, i)
+
+def two_opt_delta(tour, distance_matrix, i, j):
+    # Reversing tour[i..j] replaces edges (a, b) and (c, d) with (a, c) and (b, d).
+    n = len(tour)
+    if j - i + 1 >= n - 1:
+        return 0.0
+    a, b = tour[i - 1], tour[i]
+    c, d = tour[j], tour[(j + 1) % n]
+    return float(distance_matrix[a, c] + distance_matrix[b, d]
+                 - distance_matrix[a, b] - distance_matrix[c, d])
+
+def apply_two_opt(tour, i, j):
+    tour[i:j + 1] = tour[i:j + 1][::-1]
+
+def propose_or_opt(n, max_segment=3):
+    length = random.randint(1, min(max_segment, n - 3))
+    i = random.randrange(n - length + 1)
+    # Any position outside the segment and its predecessor.
+    p = (i + length + random.randrange(n - length - 1)) % n
+    return i, length, p
+
+def or_opt_delta(tour, distance_matrix, i, length, p):
+    # Move the segment tour[i:i + length] between tour[p] and the city after it.
+    n = len(tour)
+    previous, first = tour[i - 1], tour[i]
+    last, following = tour[i + length - 1], tour[(i + length) % n]
+    before, after = tour[p], tour[(p + 1) % n]
+    return float(distance_matrix[previous, following] + distance_matrix[before, first] + distance_matrix[last, after]
+                 - distance_matrix[previous, first] - distance_matrix[last, following] - distance_matrix[before, after])
+
+def apply_or_opt(tour, i, length, p):
+    if p > i:
+        block = tour[i:p + 1].copy()
+        tour[i:p + 1 - length] = block[length:]
+        tour[p + 1 - length:p + 1] = block[:length]
+    else:
+        block = tour[p + 1:i + length].copy()
+        tour[p + 1:p + 1 + length] = block[-length:]
+        tour[p + 1 + length:i + length] = block[:-length]
+
+MOVES = {
+    'swap': (propose_swap, swap_delta, apply_swap),
+    'two_opt': (propose_two_opt, two_opt_delta, apply_two_opt),
+    'or_opt': (propose_or_opt, or_opt_delta, apply_or_opt),
+}
+
+def move_functions(move, n):
+    # (propose, delta, apply) for a tour of n cities. Or-opt needs a segment
+    # plus two other cities, so smaller tours fall back to 2-opt.
+    if move not in MOVES:
+        raise ValueError(f"Unknown move {move!r}; supported moves: {', '.join(sorted(MOVES))}")
+    if move == 'or_opt' and n < 4:
+        move = 'two_opt'
+    return MOVES[move]
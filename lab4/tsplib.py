@@ -0,0 +1,168 @@
+import os
+
+import numpy as np
+
+# Reader for TSPLIB 95 files: symmetric .tsp problems and .opt.tour tours.
+# Distances follow the library's own rounding, so tour lengths can be compared
+# with the published optima exactly.
+
+INSTANCE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'instances')
+
+# TSPLIB's constants for GEO instances, not the true values of pi and the Earth's radius.
+GEO_PI = 3.141592
+GEO_RADIUS = 6378.388
+
+SECTIONS = ('NODE_COORD_SECTION', 'EDGE_WEIGHT_SECTION', 'DISPLAY_DATA_SECTION', 'TOUR_SECTION',
+            'FIXED_EDGES_SECTION')
+
+def read_tsplib(file_path):
+    # Returns the specification as {keyword: value}, with the sections as
+    # arrays: NODE_COORD_SECTION and DISPLAY_DATA_SECTION of shape (n, 2 or 3)
+    # in node order, EDGE_WEIGHT_SECTION flat, TOUR_SECTION as 0-based cities.
+    problem = {}
+    with open(file_path) as file:
+        lines = [line.strip() for line in file]
+    index = 0
+    while index < len(lines):
+        line = lines[index]
+        index += 1
+        if not line:
+            continue
+        if line == 'EOF':
+            break
+        keyword, _, value = line.partition(':')
+        keyword, value = keyword.strip(), value.strip()
+        if keyword not in SECTIONS:
+            problem[keyword] = int(value) if keyword in ('DIMENSION', 'CAPACITY') else value
+            continue
+
+        # A section runs until the next keyword line or EOF.
+        numbers = []
+        while index < len(lines) and not lines[index][:1].isalpha():
+            numbers.extend(lines[index].split())
+            index += 1
+        problem[keyword] = _parse_section(keyword, numbers, problem.get('DIMENSION'))
+    return problem
+
+def _parse_section(keyword, numbers, dimension):
+    if keyword == 'EDGE_WEIGHT_SECTION':
+        return np.array(numbers, dtype=np.float64)
+    if keyword in ('TOUR_SECTION', 'FIXED_EDGES_SECTION'):
+        values = np.array(numbers, dtype=np.int64)
+        end = np.flatnonzero(values == -1)
+        values = values[:end[0]] if len(end) else values
+        values -= 1
+        return values if keyword == 'TOUR_SECTION' else values.reshape(-1, 2)
+    # Node lines are "index x y" or "index x y z"; the dimension tells which.
+    width = len(numbers) // dimension
+    rows = np.array(numbers, dtype=np.float64).reshape(dimension, width)
+    coordinates = np.empty((dimension, width - 1))
+    coordinates[rows[:, 0].astype(np.int64) - 1] = rows[:, 1:]
+    return coordinates
+
+def read_tour(file_path):
+    return read_tsplib(file_path)['TOUR_SECTION']
+
+def nint(x):
+    return np.floor(x + 0.5)
+
+def _geo_radians(coordinates):
+    # DDD.MM degrees and minutes; TSPLIB truncates towards zero to split them.
+    degrees = np.trunc(coordinates)
+    return GEO_PI * (degrees + 5.0 * (coordinates - degrees) / 3.0) / 180.0
+
+def tsplib_distances(first, second, edge_weight_type):
+    # Distances between matching rows of two coordinate arrays (broadcasting allowed).
+    if edge_weight_type == 'GEO':
+        latitude_1, longitude_1 = _geo_radians(first[..., 0]), _geo_radians(first[..., 1])
+        latitude_2, longitude_2 = _geo_radians(second[..., 0]), _geo_radians(second[..., 1])
+        q1 = np.cos(longitude_1 - longitude_2)
+        q2 = np.cos(latitude_1 - latitude_2)
+        q3 = np.cos(latitude_1 + latitude_2)
+        cosine = np.clip(0.5 * ((1.0 + q1) * q2 - (1.0 - q1) * q3), -1.0, 1.0)
+        return np.floor(GEO_RADIUS * np.arccos(cosine) + 1.0)
+    dx = first[..., 0] - second[..., 0]
+    dy = first[..., 1] - second[..., 1]
+    if edge_weight_type == 'EUC_2D':
+        return nint(np.sqrt(dx * dx + dy * dy))
+    if edge_weight_type == 'CEIL_2D':
+        return np.ceil(np.sqrt(dx * dx + dy * dy))
+    if edge_weight_type == 'ATT':
+        # Pseudo-Euclidean: rounded up whenever nint would round down.
+        distance = np.sqrt((dx * dx + dy * dy) / 10.0)
+        rounded = nint(distance)
+        return np.where(rounded < distance, rounded + 1, rounded)
+    raise ValueError(f"Unsupported EDGE_WEIGHT_TYPE: {edge_weight_type}")
+
+# Which triangle each explicit format lists, row by row. A column-wise format
+# lists the same numbers as the row-wise format of the other triangle.
+EXPLICIT_FORMATS = {
+    'UPPER_ROW': ('upper', 1),
+    'LOWER_ROW': ('lower', -1),
+    'UPPER_DIAG_ROW': ('upper', 0),
+    'LOWER_DIAG_ROW': ('lower', 0),
+    'UPPER_COL': ('lower', -1),
+    'LOWER_COL': ('upper', 1),
+    'UPPER_DIAG_COL': ('lower', 0),
+    'LOWER_DIAG_COL': ('upper', 0),
+}
+
+def _explicit_matrix(weights, n, edge_weight_format, dtype):
+    if edge_weight_format == 'FULL_MATRIX':
+        return weights[:n * n].reshape(n, n).astype(dtype)
+    if edge_weight_format not in EXPLICIT_FORMATS:
+        raise ValueError(f"Unsupported EDGE_WEIGHT_FORMAT: {edge_weight_format}")
+    triangle, offset = EXPLICIT_FORMATS[edge_weight_format]
+    rows, columns = np.triu_indices(n, offset) if triangle == 'upper' else np.tril_indices(n, offset)
+    if len(weights) < len(rows):
+        raise ValueError(f"EDGE_WEIGHT_SECTION has {len(weights)} entries, {edge_weight_format} needs {len(rows)}")
+    matrix = np.zeros((n, n), dtype=dtype)
+    matrix[rows, columns] = weights[:len(rows)]
+    matrix[columns, rows] = weights[:len(rows)]
+    return matrix
+
+def distance_matrix(problem, dtype=np.float32, block_size=1024):
+    # Dense matrix of the problem's rounded distances. TSPLIB distances are
+    # integers, exact in float32 up to 2**24.
+    n = problem['DIMENSION']
+    edge_weight_type = problem.get('EDGE_WEIGHT_TYPE')
+    if edge_weight_type == 'EXPLICIT':
+        return _explicit_matrix(problem['EDGE_WEIGHT_SECTION'], n, problem.get('EDGE_WEIGHT_FORMAT'), dtype)
+    coordinates = problem['NODE_COORD_SECTION']
+    matrix = np.empty((n, n), dtype=dtype)
+    for start in range(0, n, block_size):
+        block = coordinates[start:start + block_size, np.newaxis, :]
+        matrix[start:start + block_size] = tsplib_distances(block, coordinates[np.newaxis, :, :], edge_weight_type)
+    np.fill_diagonal(matrix, 0)
+    return matrix
+
+def load_instance(name, directory=INSTANCE_DIR):
+    # A bundled instance by name: (problem, distance matrix, optimal tour or None).
+    problem = read_tsplib(os.path.join(directory, f"{name}.tsp"))
+    tour_path = os.path.join(directory, f"{name}.opt.tour")
+    optimal_tour = read_tour(tour_path) if os.path.exists(tour_path) else None
+    return problem, distance_matrix(problem), optimal_tour
+
+def known_optima(directory=INSTANCE_DIR):
+    # The solutions file lists "name : optimal length" per line, like TSPLIB's own.
+    optima = {}
+    with open(os.path.join(directory, 'solutions')) as file:
+        for line in file:
+            name, _, value = line.partition(':')
+            if value.strip():
+                optima[name.strip()] = int(value)
+    return optima
+
+def bundled_instances(directory=INSTANCE_DIR):
+    return sorted(name[:-len('.tsp')] for name in os.listdir(directory) if name.endswith('.tsp'))
+
+if __name__ == "__main__":
+    from tsp_local_search import tour_cost
+
+    optima = known_optima()
+    for name in bundled_instances():
+        problem, matrix, optimal_tour = load_instance(name)
+        line = f"{name}: n={problem['DIMENSION']}, {problem['EDGE_WEIGHT_TYPE']}, optimum {optima.get(name)}"
+        if optimal_tour is not None:
+            line += f", optimal tour length {tour_cost(optimal_tour, matrix):.0f}"
+        print(line)